@@ -0,0 +1,235 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PlayerPool:
+    """
+    Draftable players stored as one array per field, in nomination order (highest value first)
+
+    Attributes:
+        player_ids: ESPN player ID
+        names: Player name
+        nfl_teams: NFL team abbreviation
+        positions: Position names, indexed by `position_idx`
+        position_idx: Index of each player's position in `positions`
+        bye: Bye week
+        ppg: Projected points per game
+        vor: Value over replacement
+        price: Pre-draft price
+        value: Pre-draft value
+    """
+    player_ids: np.ndarray
+    names: np.ndarray
+    nfl_teams: np.ndarray
+    positions: tuple[str, ...]
+    position_idx: np.ndarray
+    bye: np.ndarray
+    ppg: np.ndarray
+    vor: np.ndarray
+    price: np.ndarray
+    value: np.ndarray
+
+    @classmethod
+    def from_price_data(cls, price_data: dict, positions: list[str]) -> 'PlayerPool':
+        """
+        Pack the output of `calculate_prices` into arrays
+
+        Args:
+            price_data: Player data keyed by ESPN player ID, sorted by value
+            positions: Draftable positions
+        """
+        players = list(price_data.values())
+        return cls(
+            player_ids=np.array(list(price_data), dtype=np.int64),
+            names=np.array([p['name'] for p in players], dtype=object),
+            nfl_teams=np.array([p['team'] for p in players], dtype=object),
+            positions=tuple(positions),
+            position_idx=np.array([positions.index(p['position']) for p in players], dtype=np.int64),
+            bye=np.array([p['bye'] for p in players], dtype=np.int64),
+            ppg=np.array([p['ppg'] for p in players], dtype=float),
+            vor=np.array([p['vor'] for p in players], dtype=float),
+            price=np.array([p['price'] for p in players], dtype=float),
+            value=np.array([p['value'] for p in players], dtype=float)
+        )
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+
+@dataclass(frozen=True)
+class DraftResults:
+    """
+    Outcome of a batch of simulated drafts, one row per sim and one column per player in `PlayerPool` order
+
+    Attributes:
+        team: Index of the team that drafted each player, -1 if undrafted
+        bid: Winning bid of each player, 0 if undrafted
+        pick: Overall pick each player was drafted with, 0 if undrafted
+        aggression: Aggression of each team, 1 = most aggressive
+    """
+    team: np.ndarray
+    bid: np.ndarray
+    pick: np.ndarray
+    aggression: np.ndarray
+
+    @property
+    def n_sims(self) -> int:
+        return self.team.shape[0]
+
+    def draft_picks(self, sim: int, pool: PlayerPool, owners: list[str]) -> dict[str, list[dict]]:
+        """Picks of a single sim by owner, in pick order"""
+        drafted = np.flatnonzero(self.team[sim] >= 0)
+        drafted = drafted[np.argsort(self.pick[sim, drafted])]
+        picks = {o: [] for o in owners}
+        for j in drafted:
+            picks[owners[self.team[sim, j]]].append({
+                'pick': int(self.pick[sim, j]),
+                'winning_bid': int(self.bid[sim, j]),
+                'player_id': int(pool.player_ids[j]),
+                'player': pool.names[j],
+                'nfl_team': pool.nfl_teams[j],
+                'bye': int(pool.bye[j]),
+                'position': pool.positions[pool.position_idx[j]],
+                'ppg': float(pool.ppg[j]),
+                'vor': float(pool.vor[j])
+            })
+        return picks
+
+
+def _triangular(u: np.ndarray, low: np.ndarray, high: np.ndarray, mode: np.ndarray) -> np.ndarray:
+    """Inverse CDF of the triangular distribution, same as `random.triangular` but vectorized"""
+    same = high == low
+    c = np.where(same, 0.5, (mode - low) / np.where(same, 1, high - low))
+    flip = u > c
+    u, c = np.where(flip, 1 - u, u), np.where(flip, 1 - c, c)
+    lo, hi = np.where(flip, high, low), np.where(flip, low, high)
+    return np.where(same, low, lo + (hi - lo) * np.sqrt(u * c))
+
+
+def _choose(weights: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Column drawn from each row with probability proportional to `weights`, given uniforms `u`"""
+    cdf = np.cumsum(weights, axis=1)
+    return np.argmax(cdf > (u * cdf[:, -1])[:, None], axis=1)
+
+
+def simulate_drafts(
+        pool: PlayerPool,
+        n_sims: int,
+        rng: np.random.Generator,
+        max_slots: dict[str, int],
+        n_teams: int = 10,
+        budget: int = 200,
+        roster_size: int = 15,
+        n_nominees: int = 10,
+        aggression_levels: tuple[int, ...] = (1, 2, 3),
+        aggression_p: tuple[float, ...] = (0.2, 0.6, 0.2)
+) -> DraftResults:
+    """
+    Simulate many independent auction drafts in lockstep. Each step nominates one player in every draft,
+    draws an opening bid, lowers it until some team can afford it, and awards the player to a team weighted
+    by its appetite. Every step is vectorized across drafts
+
+    Rules, per draft:
+        - Nominee: one of the `n_nominees` most valuable players left at a position some team can still fill, weighted by value
+        - Opening bid: triangular between 90% of price and 130% of value, capped at the second-highest max bid + $1
+        - Eligible teams: have a slot for the position, keep $1 per remaining slot after the bid, and don't need
+          every remaining slot for other empty positions. The player goes undrafted if no team can pay $1
+        - Appetite: position scarcity vs the league times roster scarcity, plus picks since the team last won, over aggression
+        - Prices left in the pool are rescaled after each pick so they add up to the money left
+
+    Args:
+        pool: Players to draft
+        n_sims: Number of drafts
+        rng: Random generator to draw from
+        max_slots: Most players a team will draft at each position
+        n_teams: Number of teams
+        budget: Budget of each team
+        roster_size: Players drafted by each team
+        n_nominees: Number of top remaining players a nomination is drawn from
+        aggression_levels: Possible team aggression, lower is more aggressive
+        aggression_p: Probability of each aggression level
+
+    Returns:
+        Drafted team, winning bid and pick of every player in every draft
+    """
+    n_players, n_pos = len(pool), len(pool.positions)
+    pos = pool.position_idx
+    pos_max = np.array([max_slots[p] for p in pool.positions])
+    total_dollars = budget * n_teams
+    total_picks = roster_size * n_teams
+    sims = np.arange(n_sims)
+
+    aggression = rng.choice(np.asarray(aggression_levels), size=(n_sims, n_teams), p=aggression_p)
+    funds = np.full((n_sims, n_teams), budget, dtype=np.int64)
+    slots = np.full((n_sims, n_teams), roster_size, dtype=np.int64)
+    max_bid = np.full((n_sims, n_teams), budget - (roster_size - 1), dtype=np.int64)
+    counts = np.zeros((n_sims, n_teams, n_pos), dtype=np.int64)
+    last_pick = np.zeros((n_sims, n_teams), dtype=np.int64)  # 0 until a team's first pick
+    available = np.ones((n_sims, n_players), dtype=bool)
+    price_left = np.full(n_sims, pool.price.sum())
+    spent = np.zeros(n_sims, dtype=np.int64)
+    scale = np.ones(n_sims)  # inflation applied to every remaining price and value
+    pick = np.ones(n_sims, dtype=np.int64)
+
+    team = np.full((n_sims, n_players), -1, dtype=np.int64)
+    bid_won = np.zeros((n_sims, n_players), dtype=np.int64)
+    pick_won = np.zeros((n_sims, n_players), dtype=np.int64)
+
+    while True:
+        # nominate from positions at least one team can still fill
+        open_pos = ((counts < pos_max) & (slots > 0)[:, :, None]).any(axis=1)
+        eligible = available & open_pos[:, pos]
+        active = (pick <= total_picks) & eligible.any(axis=1)
+        if not active.any():
+            break
+        u_nom, u_bid, u_win = rng.random((3, n_sims))
+        nominees = eligible & (np.cumsum(eligible, axis=1) <= n_nominees)
+        nom = _choose(np.where(nominees, pool.value, 0.0), u_nom)
+        nom_pos = pos[nom]
+
+        # opening bid
+        price, value = pool.price[nom] * scale, pool.value[nom] * scale
+        bid = np.ceil(_triangular(u_bid, low=0.9 * price, high=1.3 * value, mode=(price + value) / 2)).astype(np.int64)
+        cap_all = np.sort(max_bid, axis=1)[:, -2] + 1  # winner can only be pushed to the second-highest max bid + $1
+        bid = np.where(bid < 1, 1, np.where(cap_all > bid, bid, cap_all))
+
+        # highest bid each team can make, lowered until a team can make it
+        nom_counts = counts[sims, :, nom_pos]
+        empty_other = (counts == 0).sum(axis=2) - (nom_counts == 0)
+        can_fill = (nom_counts < pos_max[nom_pos][:, None]) & (slots > 0) & (empty_other < slots)
+        team_cap = np.where(can_fill, funds - slots + 1, np.iinfo(np.int64).min)
+        best_cap = team_cap.max(axis=1)
+        fits = bid <= best_cap
+        bid = np.where(fits, bid, best_cap)
+        dropped = active & ~fits & (best_cap <= 0)
+        drafted = active & ~dropped
+
+        # winner weighted by appetite
+        can_draft = team_cap >= bid[:, None]
+        others = nom_counts.sum(axis=1)[:, None] - nom_counts
+        lineup_slot_scarcity = (others + 1) / (nom_counts + 1)
+        roster_val = roster_size - slots
+        roster_scarcity = ((pick[:, None] - roster_val) / (n_teams - 1)) / (roster_val + 1)
+        pick_scarcity = pick[:, None] - last_pick
+        appetite = ((lineup_slot_scarcity * roster_scarcity) + (pick_scarcity / 10)) / aggression
+        winner = _choose(np.where(can_draft, appetite, 0.0), u_win)
+
+        d = np.flatnonzero(drafted)
+        w, j, b = winner[d], nom[d], bid[d]
+        spent[d] += b
+        scale[d] = (total_dollars - spent[d]) / price_left[d]
+        funds[d, w] -= b
+        slots[d, w] -= 1
+        max_bid[d, w] -= b - 1
+        counts[d, w, pos[j]] += 1
+        last_pick[d, w] = pick[d]
+        team[d, j], bid_won[d, j], pick_won[d, j] = w, b, pick[d]
+        pick[d] += 1
+
+        removed = np.flatnonzero(drafted | dropped)
+        available[removed, nom[removed]] = False
+        price_left[removed] -= pool.price[nom[removed]]
+
+    return DraftResults(team=team, bid=bid_won, pick=pick_won, aggression=aggression)
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+N_SEASON_WEEKS = 17  # weeks injuries are drawn over
+
+
+def injury_mask(
+        positions: np.ndarray,
+        mean_games: dict,
+        rng: np.random.Generator,
+        n_sims: int = 1,
+        n_weeks: int = N_SEASON_WEEKS
+) -> np.ndarray:
+    """
+    Weeks each player is available, for many sims in one call. Games missed follow an exponential distribution
+    truncated to the season, with the mean by position from this study (adjusted by 1 to account for championship game in week 17):
+        https://www.profootballlogic.com/articles/nfl-injury-rate-analysis/
+    The missed weeks are then drawn uniformly without replacement
+
+    Args:
+        positions: Position of each player, shape (n_players,) shared by every sim or (n_sims, n_players).
+            Positions not in `mean_games`, like DST or empty roster slots, never miss a game
+        mean_games: Mean games missed by position
+        rng: Random generator to draw from
+        n_sims: Number of sims when `positions` is shared by every sim
+        n_weeks: Number of weeks games are missed over
+
+    Returns:
+        Whether each player is available each week, shape (n_sims, n_players, n_weeks). Week 1 is index 0
+    """
+    positions = np.asarray(positions, dtype=object)
+    if positions.ndim == 1:
+        positions = np.broadcast_to(positions, (n_sims, len(positions)))
+    scale = np.array([mean_games.get(p, np.nan) for p in positions.ravel()], dtype=float).reshape(positions.shape)
+    injured = np.isfinite(scale)
+    scale = np.where(injured, scale, 1.0)
+
+    # games missed: inverse CDF of the exponential truncated to [0, n_weeks + 1), rounded down
+    u = rng.random(positions.shape)
+    b = (n_weeks + 1) / scale
+    games_missed = np.floor(-scale * np.log1p(-u * -np.expm1(-b))).astype(np.int64)
+    games_missed = np.where(injured, np.minimum(games_missed, n_weeks), 0)
+
+    # a player misses the first `games_missed` weeks of a random ordering of the season
+    order = np.argsort(rng.random(positions.shape + (n_weeks,), dtype=np.float32), axis=-1)
+    available = np.empty(order.shape, dtype=bool)
+    np.put_along_axis(available, order, np.arange(n_weeks) >= games_missed[..., None], axis=-1)
+    return available
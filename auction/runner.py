@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import numpy as np
+import pandas as pd
+
+from auction.draft_engine import PlayerPool, simulate_drafts
+from auction.season_sim import POSITIONS, PositionIndex, replacement_players, simulate_seasons
+from scripts.simulations.runner import run_sharded
+
+
+@dataclass
+class AuctionAccumulator:
+    """
+    Running totals for auction simulations, per player in `PlayerPool` order and per team
+
+    Attributes:
+        player_ids: ESPN player ID of each player
+        owners: Name of each team
+        n_sims: Number of simulations added so far
+        drafted: Number of simulations each player was drafted in
+        bid_sum: Sum of each player's winning bids
+        bid_sq_sum: Sum of each player's squared winning bids
+        pick_sum: Sum of the overall pick each player was drafted with
+        totals: Per-team sums of each counter in `COUNTERS`
+    """
+    COUNTERS: ClassVar[tuple[str, ...]] = ('spend', 'wins', 'points', 'playoffs', 'finals', 'champ')
+
+    player_ids: list[int]
+    owners: list[str]
+    n_sims: int = 0
+    drafted: np.ndarray = field(init=False)
+    bid_sum: np.ndarray = field(init=False)
+    bid_sq_sum: np.ndarray = field(init=False)
+    pick_sum: np.ndarray = field(init=False)
+    totals: dict[str, np.ndarray] = field(init=False)
+
+    def __post_init__(self):
+        n_players = len(self.player_ids)
+        self.drafted = np.zeros(n_players, dtype=np.int64)
+        self.bid_sum = np.zeros(n_players, dtype=np.int64)
+        self.bid_sq_sum = np.zeros(n_players, dtype=np.int64)
+        self.pick_sum = np.zeros(n_players, dtype=np.int64)
+        self.totals = {k: np.zeros(len(self.owners)) for k in self.COUNTERS}
+
+    def merge(self, other: 'AuctionAccumulator') -> 'AuctionAccumulator':
+        """Combine two accumulators into a new one"""
+        merged = AuctionAccumulator(player_ids=self.player_ids, owners=self.owners, n_sims=self.n_sims + other.n_sims)
+        merged.drafted = self.drafted + other.drafted
+        merged.bid_sum = self.bid_sum + other.bid_sum
+        merged.bid_sq_sum = self.bid_sq_sum + other.bid_sq_sum
+        merged.pick_sum = self.pick_sum + other.pick_sum
+        merged.totals = {k: self.totals[k] + other.totals[k] for k in self.COUNTERS}
+        return merged
+
+    def player_stats(self) -> pd.DataFrame:
+        """Draft rate and mean/standard deviation of the winning bid and pick of each player, over sims they were drafted in"""
+        n = np.maximum(self.drafted, 1)
+        mean_bid = self.bid_sum / n
+        return pd.DataFrame({
+            'player_id': self.player_ids,
+            'p_drafted': self.drafted / max(self.n_sims, 1),
+            'mean_bid': mean_bid,
+            'sd_bid': np.sqrt(np.maximum(self.bid_sq_sum / n - mean_bid ** 2, 0)),
+            'mean_pick': self.pick_sum / n
+        })
+
+    def team_stats(self) -> pd.DataFrame:
+        """Average of each counter per simulation, by team"""
+        return pd.DataFrame({'team': self.owners, **{k: v / max(self.n_sims, 1) for k, v in self.totals.items()}})
+
+
+def simulate_auctions(
+        n_sims: int,
+        rng: np.random.Generator,
+        price_data: dict,
+        owners: list[str],
+        max_slots: dict[str, int],
+        mean_games: dict,
+        weights: dict,
+        budget: int = 200,
+        roster_size: int = 15
+) -> AuctionAccumulator:
+    """
+    Draft and play out `n_sims` seasons, drawing every random number from `rng`
+
+    Args:
+        n_sims: Number of simulations
+        rng: Random generator to draw from
+        price_data: Output of `calculate_prices`, sorted by value
+        owners: Name of each team
+        max_slots: Most players a team will draft at each position
+        mean_games: Mean games missed by position
+        weights: Mean and standard deviation of the ppg weight by position
+        budget: Budget of each team
+        roster_size: Players drafted by each team
+
+    Returns:
+        Per-player draft and per-team season totals
+    """
+    pool = PlayerPool.from_price_data(price_data, POSITIONS)
+    replacement = replacement_players(price_data, PositionIndex.from_players(price_data), pool.positions)
+    drafts = simulate_drafts(
+        pool=pool,
+        n_sims=n_sims,
+        rng=rng,
+        max_slots=max_slots,
+        n_teams=len(owners),
+        budget=budget,
+        roster_size=roster_size
+    )
+    acc = AuctionAccumulator(player_ids=pool.player_ids.tolist(), owners=owners, n_sims=n_sims)
+    is_drafted = drafts.team >= 0
+    acc.drafted = is_drafted.sum(axis=0)
+    acc.bid_sum = drafts.bid.sum(axis=0)
+    acc.bid_sq_sum = (drafts.bid ** 2).sum(axis=0)
+    acc.pick_sum = drafts.pick.sum(axis=0)
+    seasons = simulate_seasons(
+        drafts=drafts,
+        pool=pool,
+        rng=rng,
+        replacement=replacement,
+        mean_games=mean_games,
+        weights=weights
+    )
+    acc.totals['spend'] = np.array([drafts.bid[drafts.team == t].sum() for t in range(len(owners))], dtype=float)
+    for k in AuctionAccumulator.COUNTERS[1:]:
+        acc.totals[k] = getattr(seasons, k).sum(axis=0).astype(float)
+    return acc
+
+
+def run_auctions(
+        price_data: dict,
+        n_sims: int,
+        seed: int | None = None,
+        n_workers: int | None = None,
+        shard_size: int = 1_000,
+        **kwargs
+) -> AuctionAccumulator:
+    """
+    Run auction simulations across a process pool. Each shard draws from its own child of the master seed,
+    so results are identical for a given seed regardless of the number of workers.
+    Worker processes may re-import the calling module, so call this under `if __name__ == '__main__':`
+
+    Args:
+        price_data: Output of `calculate_prices`, sorted by value
+        n_sims: Total number of simulations
+        seed: Master seed. None draws fresh entropy
+        n_workers: Number of worker processes. Defaults to the number of CPUs, 1 runs in process
+        shard_size: Number of simulations per shard
+        **kwargs: Passed through to `simulate_auctions`
+
+    Returns:
+        Per-player draft and per-team season totals across all shards
+    """
+    return run_sharded(
+        simulate_auctions,
+        n_sims=n_sims,
+        seed=seed,
+        n_workers=n_workers,
+        shard_size=shard_size,
+        price_data=price_data,
+        **kwargs
+    )
@@ -0,0 +1,328 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from auction.draft_engine import DraftResults, PlayerPool
+from auction.injuries import injury_mask
+
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'DST']
+STARTERS = [1, 2, 3, 1, 1]
+FLEX_POSITIONS = ['RB', 'WR']
+N_FLEX = 1
+N_PLAYOFFS = 6
+N_BYES = 2  # top seeds skip the quarterfinals
+N_WEEKS = 14  # regular season
+SCORE_SD = {'QB': 0.15}  # weekly standard deviation as a share of ppg, `OTHER_SD` for other positions
+OTHER_SD = 0.3
+PLAYOFF_SCORE_SD = {'QB': 0.2}
+PLAYOFF_OTHER_SD = 0.4
+
+
+@dataclass(frozen=True)
+class PositionIndex:
+    """
+    Lookups over a price table, built once instead of scanning every player on each call
+
+    Attributes:
+        ranked: Player IDs at each position sorted by position rank
+        by_rank: Player ID of each (position, position rank)
+        replacement: Player ID of the best undrafted player at each position and at FLEX
+    """
+    ranked: dict[str, list]
+    by_rank: dict[tuple[str, int], Any]
+    replacement: dict[str, Any]
+
+    @classmethod
+    def from_players(cls, players_data: dict, flex_positions: list[str] = FLEX_POSITIONS) -> 'PositionIndex':
+        """
+        Args:
+            players_data: Player data keyed by player ID, with `position` and `rank_pos`.
+                Replacement players are only found once `player_type` has been set by `calculate_prices`
+            flex_positions: Positions eligible for the FLEX slot
+        """
+        ranked = {}
+        for k, v in sorted(players_data.items(), key=lambda x: x[1]['rank_pos']):
+            ranked.setdefault(v['position'], []).append(k)
+        replacement = {}
+        for pos, ids in ranked.items():
+            undrafted = next((k for k in ids if players_data[k].get('player_type') == 'undrafted'), None)
+            if undrafted is not None:
+                replacement[pos] = undrafted
+        flex = [replacement[p] for p in flex_positions if p in replacement]
+        if flex:
+            replacement['FLEX'] = max(flex, key=lambda k: players_data[k]['projection_total'])
+        return cls(
+            ranked=ranked,
+            by_rank={(v['position'], v['rank_pos']): k for k, v in players_data.items()},
+            replacement=replacement
+        )
+
+    def at_rank(self, position: str, rank: int):
+        """ID of the player ranked `rank` at `position`"""
+        return self.by_rank[(position, int(rank))]
+
+    def replacement_id(self, position: str):
+        """ID of the replacement player at `position`, or at FLEX"""
+        position = position.upper()
+        if position not in self.replacement:
+            raise ValueError(f'{position} not valid. Position should be in {POSITIONS + ["FLEX"]}')
+        return self.replacement[position]
+
+
+def assign_slots(roster: list[dict]) -> None:
+    """Set the lineup slot of each player on a roster, the highest bid player at each position is pos1"""
+    starters = {p: s for p, s in zip(POSITIONS, STARTERS)}
+    slot_init = {p: 0 for p in POSITIONS + ['FLEX']}  # to check flex player
+    for player in sorted(roster, key=lambda x: (x['winning_bid'], x['vor']), reverse=True):
+        pos = player['position']
+        if slot_init[pos] < starters[pos]:
+            slot_init[pos] += 1
+            player['slot'] = pos
+        elif pos in FLEX_POSITIONS and slot_init[pos] == starters[pos] and slot_init['FLEX'] == 0:
+            player['slot'] = 'FLEX'
+            slot_init['FLEX'] += 1
+        else:
+            player['slot'] = 'BENCH'
+
+
+def roster_players(drafts: DraftResults) -> np.ndarray:
+    """
+    Rosters of every team in every draft
+
+    Returns:
+        `PlayerPool` index of each player, shape (n_sims, n_teams, roster size) in pick order. -1 for empty slots
+    """
+    n_sims, n_players = drafts.team.shape
+    n_teams = drafts.aggression.shape[1]
+    drafted = drafts.team >= 0
+    sizes = np.stack([(drafts.team == t).sum(axis=1) for t in range(n_teams)], axis=1)
+    start = np.cumsum(sizes, axis=1) - sizes
+
+    # drafted players grouped by team in pick order, undrafted last
+    key = np.where(drafted, drafts.team * (drafts.pick.max() + 1) + drafts.pick, np.iinfo(np.int64).max)
+    order = np.argsort(key, axis=1)
+    team = np.take_along_axis(drafts.team, order, axis=1)
+    sims = np.broadcast_to(np.arange(n_sims)[:, None], order.shape)
+    valid = team >= 0
+    slot = np.arange(n_players)[None, :] - start[sims, np.where(valid, team, 0)]
+
+    players = np.full((n_sims, n_teams, max(sizes.max(), 1)), -1, dtype=np.int64)
+    players[sims[valid], team[valid], slot[valid]] = order[valid]
+    return players
+
+
+def performance_weights(position_idx: np.ndarray, positions: tuple[str, ...], weights: dict, rng: np.random.Generator) -> np.ndarray:
+    """
+    Weight applied to each player's ppg to simulate over/under performance compared to projections
+
+    Args:
+        position_idx: Index of each player's position in `positions`, any shape
+        positions: Position names
+        weights: Mean and standard deviation of the weight by position. Positions without one, like DST, get 1
+        rng: Random generator to draw from
+    """
+    mean = np.array([weights[p]['mean'] if p in weights else 1 for p in positions])
+    sd = np.array([weights[p]['sd'] if p in weights else 0 for p in positions])
+    return rng.normal(mean[position_idx], sd[position_idx])
+
+
+def replacement_players(price_data: dict, index: PositionIndex, positions: tuple[str, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Replacement player started when a team can't fill a slot
+
+    Returns:
+        ppg and position index of the replacement player at each position, then at FLEX
+    """
+    ids = [index.replacement_id(p) for p in positions] + [index.replacement_id('FLEX')]
+    return (
+        np.array([price_data[k]['ppg'] for k in ids], dtype=float),
+        np.array([positions.index(price_data[k]['position']) for k in ids], dtype=np.int64)
+    )
+
+
+def _sd_share(positions: tuple[str, ...], shares: dict, other: float) -> np.ndarray:
+    return np.array([shares.get(p, other) for p in positions])
+
+
+@dataclass(frozen=True)
+class SeasonResults:
+    """
+    Outcome of a batch of simulated seasons. Player arrays have shape (n_sims, n_teams, roster size),
+    team arrays have shape (n_sims, n_teams)
+
+    Attributes:
+        ppg: Weighted ppg of each player, 0 for empty slots
+        available: Whether each player is available each week, week 1 is index 0
+        wins: Regular season wins, a win is scoring more than the league median
+        points: Regular season points
+        playoffs: Whether the team made the playoffs
+        finals: Whether the team made the final
+        champ: Whether the team won the final
+    """
+    ppg: np.ndarray
+    available: np.ndarray
+    wins: np.ndarray
+    points: np.ndarray
+    playoffs: np.ndarray
+    finals: np.ndarray
+    champ: np.ndarray
+
+    def team_results(self, sim: int, owners: list[str]) -> dict[str, dict]:
+        """Results of a single sim by owner"""
+        return {
+            o: {
+                'wins': int(self.wins[sim, t]),
+                'points': float(self.points[sim, t]),
+                'playoffs': int(self.playoffs[sim, t]),
+                'finals': int(self.finals[sim, t]),
+                'champ': int(self.champ[sim, t])
+            }
+            for t, o in enumerate(owners)
+        }
+
+
+def evaluate_seasons(
+        ppg: np.ndarray,
+        position_idx: np.ndarray,
+        bye: np.ndarray,
+        available: np.ndarray,
+        rng: np.random.Generator,
+        replacement_ppg: np.ndarray,
+        replacement_pos: np.ndarray,
+        score_sd: np.ndarray,
+        playoff_score_sd: np.ndarray,
+        starters: list[int] = STARTERS,
+        flex_idx: tuple[int, ...] = (1, 2),
+        n_weeks: int = N_WEEKS,
+        n_playoffs: int = N_PLAYOFFS,
+        n_byes: int = N_BYES
+) -> dict[str, np.ndarray]:
+    """
+    Play out the regular season and playoffs of many leagues at once. Each week every team starts its top
+    `starters` available players by ppg at each position, then a FLEX drawn from its remaining flex players
+    weighted by ppg. Slots nobody can fill go to the replacement player. Weekly scores are normal around
+    the lineup's ppg. Teams win a week by scoring more than the league median, and advance a playoff round
+    by scoring more than the median of the teams left
+
+    Args:
+        ppg: Points per game of each player, shape (n_sims, n_teams, roster size)
+        position_idx: Position index of each player, -1 for empty roster slots
+        bye: Bye week of each player
+        available: Whether each player is available each week, shape (n_sims, n_teams, roster size, weeks). Week 1 is index 0
+        rng: Random generator to draw from
+        replacement_ppg: ppg of the replacement player at each position, then at FLEX
+        replacement_pos: Position index of each replacement player
+        score_sd: Weekly standard deviation as a share of ppg by position, regular season
+        playoff_score_sd: Weekly standard deviation as a share of ppg by position, playoffs
+        starters: Starters at each position
+        flex_idx: Positions eligible for the FLEX slot
+        n_weeks: Weeks in the regular season, the playoffs are the two weeks after
+        n_playoffs: Number of playoff teams
+        n_byes: Number of top seeds going straight to the semifinals
+
+    Returns:
+        wins, points, playoffs, finals and champ of each team, shape (n_sims, n_teams)
+    """
+    n_sims, n_teams, _ = ppg.shape
+    occupied = position_idx >= 0
+    is_flex = np.isin(position_idx, flex_idx)
+
+    def week_points(week: int, sd_share: np.ndarray) -> np.ndarray:
+        active = occupied & (bye != week) & available[..., week - 1]
+        mean = np.zeros((n_sims, n_teams))
+        var = np.zeros((n_sims, n_teams))
+        started = np.zeros(active.shape, dtype=bool)
+        for p, k in enumerate(starters):
+            candidates = np.where(active & (position_idx == p), ppg, -np.inf)
+            top = np.argsort(-candidates, axis=2, kind='stable')[..., :k]
+            top_ppg = np.take_along_axis(candidates, top, axis=2)
+            filled = np.isfinite(top_ppg)
+            chosen = np.zeros(active.shape, dtype=bool)
+            np.put_along_axis(chosen, top, filled, axis=2)
+            started |= chosen
+            lineup = np.where(filled, top_ppg, replacement_ppg[p])
+            mean += lineup.sum(axis=2)
+            var += ((lineup * sd_share[p]) ** 2).sum(axis=2)
+
+        # flex drawn from the remaining flex players weighted by ppg
+        weight = np.where(active & is_flex & ~started, np.where(ppg > 0, ppg, 0.1), 0.0)
+        cdf = np.cumsum(weight, axis=2)
+        u = rng.random((n_sims, n_teams))
+        flex = np.argmax(cdf > (u * cdf[..., -1])[..., None], axis=2)[..., None]
+        has_flex = cdf[..., -1] > 0
+        flex_ppg = np.where(has_flex, np.take_along_axis(ppg, flex, axis=2)[..., 0], replacement_ppg[-1])
+        flex_pos = np.where(has_flex, np.take_along_axis(position_idx, flex, axis=2)[..., 0], replacement_pos[-1])
+        mean += flex_ppg
+        var += (flex_ppg * sd_share[flex_pos]) ** 2
+        return rng.normal(mean, np.sqrt(var))
+
+    def advance(teams: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        median = np.nanmedian(np.where(teams, scores, np.nan), axis=1, keepdims=True)
+        return teams & (scores > median)
+
+    wins = np.zeros((n_sims, n_teams), dtype=np.int64)
+    points = np.zeros((n_sims, n_teams))
+    for week in range(1, n_weeks + 1):
+        scores = week_points(week, score_sd)
+        points += scores
+        wins += scores > np.median(scores, axis=1, keepdims=True)
+
+    # seeds by wins, then points
+    order = np.lexsort((points, wins), axis=1)[:, ::-1]
+    seed = np.empty_like(order)
+    np.put_along_axis(seed, order, np.arange(n_teams)[None, :], axis=1)
+    playoffs = seed < n_playoffs
+    quarterfinals = playoffs & (seed >= n_byes)
+    semifinals = (seed < n_byes) | advance(quarterfinals, week_points(n_weeks + 1, playoff_score_sd))
+    finals = advance(semifinals, week_points(n_weeks + 2, playoff_score_sd))
+    champ = advance(finals, week_points(n_weeks + 2, playoff_score_sd))
+    return {'wins': wins, 'points': points, 'playoffs': playoffs, 'finals': finals, 'champ': champ}
+
+
+def simulate_seasons(
+        drafts: DraftResults,
+        pool: PlayerPool,
+        rng: np.random.Generator,
+        replacement: tuple[np.ndarray, np.ndarray],
+        mean_games: dict,
+        weights: dict
+) -> SeasonResults:
+    """
+    Play out a season for every draft in a batch. Each drafted player gets games missed and a ppg
+    weighted by over/under performance, then `evaluate_seasons` plays the regular season and playoffs
+
+    Args:
+        drafts: Simulated drafts
+        pool: Players the drafts were simulated with
+        rng: Random generator to draw from
+        replacement: Output of `replacement_players`
+        mean_games: Mean games missed by position
+        weights: Mean and standard deviation of the ppg weight by position
+
+    Returns:
+        Player seasons and team outcomes of every draft
+    """
+    players = roster_players(drafts)
+    occupied = players >= 0
+    idx = np.where(occupied, players, 0)
+    pos = pool.position_idx[idx]
+    ppg = np.where(occupied, pool.ppg[idx] * performance_weights(pos, pool.positions, weights, rng), 0.0)
+    names = np.where(occupied, np.array(pool.positions, dtype=object)[pos], '')
+    available = injury_mask(names.reshape(len(names), -1), mean_games, rng).reshape(names.shape + (-1,))
+    position_idx = np.where(occupied, pos, -1)
+
+    outcomes = evaluate_seasons(
+        ppg=ppg,
+        position_idx=position_idx,
+        bye=pool.bye[idx],
+        available=available,
+        rng=rng,
+        replacement_ppg=replacement[0],
+        replacement_pos=replacement[1],
+        score_sd=_sd_share(pool.positions, SCORE_SD, OTHER_SD),
+        playoff_score_sd=_sd_share(pool.positions, PLAYOFF_SCORE_SD, PLAYOFF_OTHER_SD),
+        flex_idx=[pool.positions.index(p) for p in FLEX_POSITIONS]
+    )
+    return SeasonResults(ppg=ppg, available=available, **outcomes)
@@ -1,5 +1,6 @@
 from scripts.records.initialize import *
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 
 
@@ -13,3 +14,4 @@ for idx, row in standings.iterrows():
     db = Database(table=records_table, columns=records_cols, values=tuple(row))
     db.sql_insert_query()
     db.commit_row()
+invalidate_tables('alltime_standings')
@@ -2,9 +2,11 @@ from scripts.api.dataloader import DataLoader
 from scripts.api.fantasy_pros import FantasyPros
 from scripts.api.settings import TeamSettings
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 from scripts.utils import utils
 from scripts.simulations.simulations import Simulation
+from scripts.simulations.runner import run_sharded
 
 import time
 # import json
@@ -14,13 +16,20 @@ import time
 #     mapping = json.load(f)
 
 
-def load_betting_table(dataloader:DataLoader, fpros: FantasyPros, n_sims: int=100_000):
+def load_betting_table(
+        dataloader:DataLoader,
+        fpros: FantasyPros,
+        n_sims: int=100_000,
+        seed: int | None = None,
+        n_workers: int | None = None
+):
     day = constants._TODAY.strftime('%a')
 
     # load parameters
     teams = TeamSettings(dataloader)
     start = time.perf_counter()
-    sim_results = Simulation(dataloader, fpros=fpros).simulate_week(n_sims=n_sims)
+    sim = Simulation(dataloader, fpros=fpros)
+    sim_results = run_sharded(sim.simulate_week, n_sims=n_sims, seed=seed, n_workers=n_workers)
     end = time.perf_counter()
     print((end-start) / 60)
 
@@ -45,6 +54,7 @@ def load_betting_table(dataloader:DataLoader, fpros: FantasyPros, n_sims: int=10
         upsert=True,
         update_columns=['avg_score', 'p_win', 'p_tophalf', 'p_highest', 'p_lowest']
     )
+    invalidate_tables('betting_table')
 
 if __name__ == '__main__':
     dataloader = DataLoader(year=constants.SEASON, week=constants.WEEK)
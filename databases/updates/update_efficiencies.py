@@ -3,6 +3,7 @@ from scripts.api.models.player import ParseContext, PlayerView
 from scripts.api.dataloader import DataLoader
 from scripts.api.fantasy_pros import FantasyPros
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.api.models.team import Team
 from scripts.utils import constants
 
@@ -38,6 +39,7 @@ def load_efficiency(
         upsert=upsert,
         update_columns=upsert_cols
     )
+    invalidate_tables('efficiency')
 
 if __name__ == '__main__':
     d = DataLoader(year=constants.SEASON, week=constants.WEEK-1)
@@ -2,6 +2,7 @@ from scripts.scenarios.scenarios import get_h2h
 from scripts.api.dataloader import DataLoader
 from scripts.api.models.schedule import TeamResult
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 
 
@@ -29,6 +30,7 @@ def load_h2h(
         upsert=upsert,
         update_columns=upsert_cols
     )
+    invalidate_tables('h2h')
 
 if __name__ == '__main__':
     d = DataLoader(year=constants.SEASON, week=constants.WEEK)
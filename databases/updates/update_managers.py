@@ -1,5 +1,6 @@
 from scripts.utils.constants import TEAM_IDS
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 
 rows = []
 for mid, team in TEAM_IDS.items():
@@ -14,3 +15,4 @@ Database().batch_insert(
     upsert=False,
     update_columns=None
 )
+invalidate_tables('managers')
@@ -1,4 +1,5 @@
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.api.dataloader import DataLoader
 from scripts.api.models.schedule import TeamResult
 from scripts.api.settings import TeamSettings
@@ -42,6 +43,7 @@ def load_matchups(
         upsert=upsert,
         update_columns=upsert_cols
     )
+    invalidate_tables('matchups')
 
 if __name__ == '__main__':
     d = DataLoader(year=constants.SEASON, week=constants.WEEK-1)
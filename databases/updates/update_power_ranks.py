@@ -1,6 +1,7 @@
 from scripts.api.dataloader import DataLoader
 from scripts.api.settings import LeagueSettings, TeamSettings
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 from scripts.home.power_ranks import power_rank
 
@@ -28,8 +29,9 @@ df_final['rank_change'] = df_final.groupby(['team'])['power_rank'].diff()
 df_final = df_final[constants.POWER_RANK_COLUMNS.split(', ')].fillna(0)
 df_final = df_final[df_final.week==week]
 
-Database().batch_insert(
+Database().insert_frame(
     table='power_ranks',
-    columns=constants.POWER_RANK_COLUMNS,
-    rows=[tuple(row) for _, row in df_final.iterrows()]
+    df=df_final,
+    columns=constants.POWER_RANK_COLUMNS
 )
+invalidate_tables('power_ranks')
@@ -2,6 +2,7 @@ from scripts.scenarios.scenarios import schedule_switcher
 from scripts.api.models.schedule import TeamResult
 from scripts.api.dataloader import DataLoader
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 
 
@@ -30,6 +31,7 @@ def load_switcher(
         upsert=upsert,
         update_columns=upsert_cols
     )
+    invalidate_tables('schedule_switcher')
 
 if __name__ == '__main__':
     d = DataLoader(year=constants.SEASON, week=constants.WEEK-1)
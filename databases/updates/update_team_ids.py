@@ -1,5 +1,6 @@
 from scripts.api.dataloader import DataLoader
 from scripts.utils.database import Database
+from scripts.utils.page_cache import invalidate_tables
 from scripts.utils import constants
 
 
@@ -26,6 +27,7 @@ def update_team_ids(
         upsert=upsert,
         update_columns=update_columns
     )
+    invalidate_tables('team_ids')
 
 
 if __name__ == '__main__':
@@ -18,17 +18,17 @@ projections['actual'] = None
 projections.columns = ['id', 'season', 'week', 'name', 'espn_id', 'position', 'receptions', 'projection', 'actual']
 
 try:
-    Database().batch_insert(
+    Database().insert_frame(
         table='player_projections',
-        columns=constants.PROJECTIONS_COLUMNS,
-        rows=[tuple(row) for _, row in projections.iterrows()]
+        df=projections,
+        columns=constants.PROJECTIONS_COLUMNS
     )
 except mysql.connector.errors.IntegrityError:
     # update projections
-    Database().batch_insert(
+    Database().insert_frame(
         table='player_projections',
+        df=projections,
         columns=constants.PROJECTIONS_COLUMNS,
-        rows=[tuple(row) for _, row in projections.iterrows()],
         upsert=True,
         update_columns=['projection']
     )
@@ -46,10 +46,10 @@ if day == 'Wed':
                     and stat['statSourceId'] == 0
             ):
                 actual = stat['appliedTotal']
-        Database().batch_insert(
+        Database().insert_frame(
             table='player_projections',
+            df=projections,
             columns=constants.PROJECTIONS_COLUMNS,
-            rows=[tuple(row) for _, row in projections.iterrows()],
             upsert=True,
             update_columns=['actual']
         )
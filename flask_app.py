@@ -2,51 +2,64 @@ from flask import Flask, render_template
 from flask_fontawesome import FontAwesome
 
 import scripts.utils.utils as ut
-from data_prep import *
 from scripts.utils.constants import RECORDS_COLUMNS_FLASK, ALLTIME_COLUMNS_FLASK
+from scripts.utils.page_cache import PageCache
+from scripts.utils.snapshots import SnapshotStore
+import data_prep
 
 
 # create flask app
 app = Flask(__name__)
 fa = FontAwesome(app)
 
+# pages are served from the data_prep.py snapshot, or built on first request once invalidated by a database update
+pages = PageCache(builders=data_prep.PAGE_BUILDERS, snapshots=SnapshotStore())
+
 ###########################
 # Flask routes
 ##########################
 
 @app.route("/")
 def home():
+    m = pages.get('home')
+    week, clinches, pr_table = m['week'], m['clinches'], m['pr_table']
     week_str = 'Final' if week > 14 else f'Week {week-1}'
     headings_st = tuple(['Rk', 'Team', 'Overall', 'Win%', 'Matchup', 'TopHalf', 'Points', 'WB-Bye', 'WB-5', 'PB-6', 'E#-Bye', 'E#-5'])
-    data_st = standings_to_flask
+    data_st = m['standings_to_flask']
 
-    cl_cols = ['Team', 'To Clinch', 'Net Wins', 'Clinch Over (Net Pts)' if week == params.regular_season_end else 'Clinch Over', 'Clinch Probability']
+    cl_cols = ['Team', 'To Clinch', 'Net Wins', 'Clinch Over (Net Pts)' if week == m['regular_season_end'] else 'Clinch Over', 'Clinch Probability']
     headings_cl = tuple(cl_cols) if 'clinches' in clinches else tuple()
     data_cl = ut.flask_get_data(clinches['clinches']) if 'clinches' in clinches else tuple()
 
-    el_cols = ['Team', 'Elim. From', 'Net Wins', 'Elim. By (Net Pts)' if week == params.regular_season_end else 'Elim. By', 'Elim. Probability']
+    el_cols = ['Team', 'Elim. From', 'Net Wins', 'Elim. By (Net Pts)' if week == m['regular_season_end'] else 'Elim. By', 'Elim. Probability']
     headings_el = tuple(el_cols) if 'elims' in clinches else tuple()
     data_el = ut.flask_get_data(clinches['elims']) if 'elims' in clinches else tuple()
 
+    headings_la = tuple(['Team', 'Scenario', 'Clinch Probability', 'Elim. Probability'])
+    data_la = m.get('lookahead', [])  # absent from snapshots written before it was added
+
     headings_pr = tuple(['Team', 'Season', 'Recency', 'Consistency', 'Manager', 'Luck', 'Rank', '1 Week \u0394', 'Score', '1 Week \u0394'])
-    data_pr = ut.flask_get_data(pr_table[pr_cols])
+    data_pr = ut.flask_get_data(pr_table[m['pr_cols']])
 
     return render_template(
         "powerrank.html", week=week_str,
         headings_st=headings_st, data_st=data_st,
         headings_cl=headings_cl, data_cl=data_cl,
         headings_el=headings_el, data_el=data_el,
+        headings_la=headings_la, data_la=data_la,
         headings_pr=headings_pr, data_pr=data_pr,
-        rank_data=rank_data, score_data=score_data,
+        rank_data=m['rank_data'], score_data=m['score_data'],
     )
 
 @app.route("/simulations/")
 def sims():
+    m = pages.get('simulations')
+    season_sim_wins_table, season_sim_ranks_table = m['season_sim_wins_table'], m['season_sim_ranks_table']
     headings_bets = tuple(['Team', 'Points', 'Matchup', 'TopHalf', 'Highest', 'Lowest'])
-    data_bets = ut.flask_get_data(betting_table[['team', 'avg_score', 'p_win', 'p_tophalf', 'p_highest', 'p_lowest']])
+    data_bets = ut.flask_get_data(m['betting_table'][['team', 'avg_score', 'p_win', 'p_tophalf', 'p_highest', 'p_lowest']])
 
     headings_season_sim = tuple(['Team', 'Matchup', 'TopHalf', 'Total', 'Points', 'Playoff%', 'Finals%', 'Champion%', 'xPay Out'])
-    data_season_sim = ut.flask_get_data(season_sim_table)
+    data_season_sim = ut.flask_get_data(m['season_sim_table'])
 
     headings_w = tuple(season_sim_wins_table.columns)
     data_w = ut.flask_get_data(season_sim_wins_table)
@@ -55,21 +68,23 @@ def sims():
     data_r = ut.flask_get_data(season_sim_ranks_table)
 
     return render_template(
-        "simulations.html", week=f'Week {week}',
+        "simulations.html", week=f'Week {m['week']}',
         headings_bets=headings_bets, data_bets=data_bets,
         headings_s=headings_season_sim, data_s=data_season_sim,
         headings_w=headings_w, data_w=data_w,
         headings_r=headings_r, data_r=data_r,
-        betting=betting_chart_data, probs=playoff_chart_data,
-        tstamp_bets=timestamp_betting, tstamp_s=timestamp_season_sim
+        betting=m['betting_chart_data'], probs=m['playoff_chart_data'],
+        tstamp_bets=m['timestamp_betting'], tstamp_s=m['timestamp_season_sim']
     )
 
 @app.route("/scenarios/")
 def scenarios():
+    m = pages.get('scenarios')
+    wins_vs_opp, wins_by_week, ss_disp = m['wins_vs_opp'], m['wins_by_week'], m['ss_disp']
     headings_h2h = tuple(
         ut.flatten_list(
             [
-                ['Team'], list(wins_vs_opp.columns[1:len(teams.team_ids)+1]), ['Record', 'Win%']
+                ['Team'], list(wins_vs_opp.columns[1:m['n_teams']+1]), ['Record', 'Win%']
             ]
         )
     )
@@ -78,7 +93,7 @@ def scenarios():
     headings_wk = tuple(
         ut.flatten_list(
             [
-                ['Team'], list(wins_by_week.columns[1:params.regular_season_end+1]), ['# First', '# Last']
+                ['Team'], list(wins_by_week.columns[1:m['regular_season_end']+1]), ['# First', '# Last']
             ]
         )
     )
@@ -93,7 +108,7 @@ def scenarios():
         for row in data_wk
     ])
 
-    headings_ss = tuple(ut.flatten_list([['Team'], list(ss_disp.columns[1:len(teams.team_ids)+2])]))
+    headings_ss = tuple(ut.flatten_list([['Team'], list(ss_disp.columns[1:m['n_teams']+2])]))
     data_ss = ut.flask_get_data(ss_disp)
 
     return render_template("scenarios.html",
@@ -103,10 +118,12 @@ def scenarios():
 
 @app.route("/efficiency/")
 def eff():
-    return render_template("efficiencies.html", eff_chart_data=eff_chart_data)
+    return render_template("efficiencies.html", eff_chart_data=pages.get('efficiency')['eff_chart_data'])
 
 @app.route("/champions/")
 def champs():
+    m = pages.get('champions')
+    prev_champs, champ_count = m['prev_champs'], m['champ_count']
     headings_pc = tuple(prev_champs.columns)
     data_pc = ut.flask_get_data(prev_champs)
 
@@ -119,6 +136,8 @@ def champs():
 
 @app.route("/records/")
 def records():
+    m = pages.get('records')
+    alltime_df, records_df = m['alltime_df'], m['records_df']
     headings_alltime = tuple(['Team', 'Seasons', 'Playoffs', 'Overall', 'Win%', 'Matchup', 'Top Half', 'Points'])
     data_alltime = ut.flask_get_data(alltime_df[ALLTIME_COLUMNS_FLASK])
 
@@ -0,0 +1,92 @@
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+import json
+import os
+import sqlite3
+import time
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: str
+    etag: str | None
+    fetched_at: float
+    immutable: bool
+
+    def is_fresh(self, ttl: int) -> bool:
+        """True if the response can be served without asking ESPN"""
+        return self.immutable or (time.time() - self.fetched_at) < ttl
+
+
+class ResponseCache:
+    """Disk-backed cache of raw ESPN API responses, stored in SQLite"""
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite file to store responses in. Parent directories are created if needed
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    year INTEGER,
+                    view TEXT,
+                    week INTEGER,
+                    body TEXT,
+                    etag TEXT,
+                    fetched_at REAL,
+                    immutable INTEGER
+                )
+            ''')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection committed on success and closed on exit"""
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def key(league_id: str, year: int, view: str, week: int | None, filters: dict | None) -> str:
+        """Cache key for a single request"""
+        return json.dumps([league_id, year, view, week, filters], sort_keys=True)
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT body, etag, fetched_at, immutable FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(body=row[0], etag=row[1], fetched_at=row[2], immutable=bool(row[3]))
+
+    def put(
+            self,
+            key: str,
+            year: int,
+            view: str,
+            week: int | None,
+            body: str,
+            etag: str | None,
+            immutable: bool
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, year, view, week, body, etag, time.time(), int(immutable))
+            )
+
+    def touch(self, key: str) -> None:
+        """Mark a cached response as revalidated"""
+        with self._connect() as conn:
+            conn.execute('UPDATE responses SET fetched_at = ? WHERE key = ?', (time.time(), key))
+
+    def clear(self, year: int | None = None) -> None:
+        """Remove cached responses, for a single season if `year` is given"""
+        with self._connect() as conn:
+            if year is None:
+                conn.execute('DELETE FROM responses')
+            else:
+                conn.execute('DELETE FROM responses WHERE year = ?', (year,))
@@ -1,11 +1,20 @@
+from scripts.api.cache import ResponseCache
 from scripts.utils import constants as const
 
 from cachetools.func import ttl_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 
+# shared keep-alive connection pool for every DataLoader
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
 class DataLoader:
     """Load a view from ESPN's API"""
     def __init__(
@@ -14,14 +23,27 @@ class DataLoader:
             week: int = None,
             league_id: int = const.LEAGUE_ID,
             swid: str = const.SWID,
-            espn_s2: str = const.ESPN_S2
+            espn_s2: str = const.ESPN_S2,
+            cache: ResponseCache | None = None,
+            offline: bool = const.ESPN_OFFLINE,
+            cache_ttl: int = const.ESPN_CACHE_TTL
     ):
+        """
+        Args:
+            cache: Disk cache for responses. Defaults to the cache at `constants.ESPN_CACHE_PATH`
+            offline: Only serve responses from the cache, never call ESPN
+            cache_ttl: Seconds a current season response is served before revalidating with ESPN.
+                Responses for completed seasons never expire
+        """
         self.year = year
         self.week = week
         self.league_id = str(league_id)
         self.swid = swid
         self.espn_s2 = espn_s2
         self.endpoint = f'https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl'
+        self.cache = cache or ResponseCache(path=const.ESPN_CACHE_PATH)
+        self.offline = offline
+        self.cache_ttl = cache_ttl
 
     def _loader(
             self,
@@ -34,29 +56,91 @@ class DataLoader:
             # data before 2018 stored in this endpoint
             url = f'{self.endpoint}/leagueHistory/{self.league_id}?seasonId={self.year}&view={view}'
 
-        headers = None
+        key = self.cache.key(league_id=self.league_id, year=self.year, view=view, week=self.week, filters=filters)
+        cached = self.cache.get(key)
+        if cached and cached.is_fresh(ttl=self.cache_ttl):
+            return self._parse(cached.body)
+        if self.offline:
+            if cached:
+                return self._parse(cached.body)
+            raise ValueError(f'No cached response for view {view} (year={self.year}, week={self.week}) in offline mode')
+
+        headers = {}
         if filters:
-            headers = {
-                'x-fantasy-filter': json.dumps(filters)
-            }
+            headers['x-fantasy-filter'] = json.dumps(filters)
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
 
         params = {
             'scoringPeriodId': self.week,
             'matchupPeriodId': self.week
         }
 
-        r = requests.get(url,
-                         cookies={
-                             'SWID': self.swid,
-                             'espn_s2': self.espn_s2
-                         },
-                         headers=headers,
-                         params=params)
+        r = _SESSION.get(url,
+                        cookies={
+                            'SWID': self.swid,
+                            'espn_s2': self.espn_s2
+                        },
+                        headers=headers or None,
+                        params=params)
+
+        if r.status_code == 304 and cached:
+            self.cache.touch(key)
+            return self._parse(cached.body)
 
-        d = r.json()
+        if r.ok:
+            self.cache.put(
+                key=key,
+                year=self.year,
+                view=view,
+                week=self.week,
+                body=r.text,
+                etag=r.headers.get('ETag'),
+                immutable=self.year < const.SEASON  # completed seasons never change
+            )
+        return self._parse(r.text)
 
+    def _parse(self, body: str) -> dict[str, dict]:
+        d = json.loads(body)
         return d if self.year >= 2018 else d[0]
 
+    def prefetch(
+            self,
+            views: list[str],
+            weeks: list[int],
+            max_workers: int = 8
+    ) -> dict[tuple[str, int], dict]:
+        """
+        Fetch every view/week combination concurrently
+
+        Args:
+            views: ESPN views to load, e.g. `mMatchup`
+            weeks: Scoring periods to load each view for
+            max_workers: Most requests in flight at once
+
+        Returns:
+            Dictionary of responses keyed by (view, week)
+        """
+        def fetch(view_week: tuple[str, int]) -> dict:
+            view, week = view_week
+            loader = DataLoader(
+                year=self.year,
+                week=week,
+                league_id=self.league_id,
+                swid=self.swid,
+                espn_s2=self.espn_s2,
+                cache=self.cache,
+                offline=self.offline,
+                cache_ttl=self.cache_ttl
+            )
+            return loader._loader(view=view)
+
+        keys = list(product(views, weeks))
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return dict(zip(keys, executor.map(fetch, keys)))
+
     @ttl_cache(maxsize=1, ttl=300)
     def settings(self):
         return self._loader(view='mSettings')
@@ -75,30 +159,36 @@ class DataLoader:
     def standings(self):
         return self._loader(view='mStandings')
 
+    @staticmethod
+    def schedule_scores(schedule: list[dict]) -> dict[int, list[float]]:
+        """
+        Group every team score in an `mMatchup` schedule by matchup period in a single pass
+
+        Args:
+            schedule: The `schedule` list of an `mMatchup` response
+
+        Returns:
+            Sorted team scores keyed by matchup period
+        """
+        scores = {}
+        for m in schedule:
+            week_scores = scores.setdefault(m['matchupPeriodId'], [])
+            for tm in ['home', 'away']:
+                if 'totalPoints' in m.get(tm, {}):
+                    week_scores.append(m[tm]['totalPoints'])
+        return {week: sorted(v) for week, v in scores.items()}
+
     def week_scores(self, week: int):
         if not week:
             week = self.week
-        data = self._loader(view='mMatchup')
-        matchups = [m for m in data['schedule'] if m['matchupPeriodId'] == week]
-        if week:
-            scores = []
-            for m in matchups:
-                for i, tm in enumerate(['home', 'away']):
-                    try:
-                        team_entry = m[tm]
-                        scores.append(team_entry['totalPoints'])
-                    except KeyError:
-                        continue
-            return scores
-        else:
+        if not week:
             raise ValueError('Must specify week')
+        data = self._loader(view='mMatchup')
+        return self.schedule_scores(data['schedule']).get(week, [])
 
     def all_scores(self):
-        scores = {}
-        for i in range(1, self.week+1):
-            week_scores = self.week_scores(week=i)
-            scores[i] = sorted(week_scores)
-        return scores
+        scores = self.schedule_scores(self._loader(view='mMatchup')['schedule'])
+        return {i: scores.get(i, []) for i in range(1, self.week+1)}
 
     @ttl_cache(maxsize=1, ttl=300)
     def matchups(self):
@@ -136,3 +136,17 @@ class FantasyPros:
             )
             players.append(player)
         return players
+
+    @ttl_cache(maxsize=20, ttl=3600)
+    def get_projection_index(self, ros: bool = False) -> dict[int, dict]:
+        """
+        FantasyPros projections indexed by ESPN player ID, built once per projections payload
+        :param ros: Include rest of season projections (default: False)
+
+        :return: Dictionary of projections with ESPN player ID as key. The first projection wins if IDs repeat
+        """
+        index = {}
+        for player in self.get_projections(ros=ros):
+            if player['espn_id'] is not None:
+                index.setdefault(player['espn_id'], player)
+        return index
@@ -43,6 +43,11 @@ class Player:
     def __repr__(self) -> str:
         return f'Player(name={self.name})'
 
+    @staticmethod
+    def index_rosters(rosters_data: dict) -> dict[int, dict]:
+        """Returns {team_id: roster} from an mRoster payload"""
+        return {r['id']: r.get('roster', {}) for r in rosters_data.get('teams', [])}
+
     @classmethod
     def build_lineup_slot_lookup(
             cls,
@@ -56,13 +61,13 @@ class Player:
         slot_map: dict[int, int] = {}
 
         teams_list = teams_data.get("teams", teams_data)
-        rosters = rosters_data.get('teams', [])
+        rosters = cls.index_rosters(rosters_data)
         for team_obj in teams_list:
             team_id = team_obj.get("id")
             if team_id is None:
                 continue
 
-            roster_data = [r for r in rosters if r['id'] == team_id][0].get('roster', {})
+            roster_data = rosters.get(team_id, {})
             entries = roster_data.get("entries", [])
 
             for player in entries:
@@ -183,20 +188,24 @@ class Player:
             dataloader: DataLoader,
             fpros: FantasyPros,
             obj: list[dict],
-            ctx: ParseContext
+            ctx: ParseContext,
+            fp_index: dict[int, dict] | None = None,
+            slot_lookup: dict[int, int] | None = None
     ) -> dict[int, 'Player']:
-        """get all player objects from ESPN"""
-
-        fantasy_pros = fpros.get_projections()
-        slot_lookup = None
-        if ctx.week:
-            teams_data = dataloader.teams()
-            rosters_data = dataloader.rosters()
-            slot_lookup = cls.build_lineup_slot_lookup(teams_data, rosters_data)
+        """
+        get all player objects from ESPN
+
+        `fp_index` (from `FantasyPros.get_projection_index`) and `slot_lookup` (from `build_lineup_slot_lookup`)
+        are built here when not given. Pass them in when building several rosters from the same payloads
+        """
+        if fp_index is None:
+            fp_index = fpros.get_projection_index()
+        if slot_lookup is None and ctx.week:
+            slot_lookup = cls.build_lineup_slot_lookup(dataloader.teams(), dataloader.rosters())
         players = {}
         for p in obj:
             espn_id_col = 'id' if 'id' in p else 'playerId'
-            p_fp = next((fp for fp in fantasy_pros if fp.get('espn_id') == p.get(espn_id_col)), None)
+            p_fp = fp_index.get(p.get(espn_id_col))
             player = cls.create_player(obj=p, fpros=p_fp, ctx=ctx, slot_lookup=slot_lookup)
             players[player.id] = player
         return players
@@ -76,9 +76,11 @@ class Matchup:
             params: LeagueSettings
     ) -> dict[int, 'Matchup']:
         all_matchups = {}
-        for w in range(1, params.regular_season_end + params.playoff_length + 1):
+        weeks = list(range(1, params.regular_season_end + params.playoff_length + 1))
+        payloads = DataLoader().prefetch(views=['mMatchup'], weeks=weeks)
+        for w in weeks:
             # scores = DataLoader(week=w).week_scores(week=w)
-            matchups_obj = DataLoader(week=w).matchups()
+            matchups_obj = payloads[('mMatchup', w)]
             week_matchups = [m for m in matchups_obj['schedule'] if m['matchupPeriodId'] == w]
             matchups = []
             # median = sum(sorted(scores)[(len(scores) // 2) - 1: (len(scores) // 2) + 1]) / 2
@@ -159,17 +161,21 @@ class TeamResult:
                     )
         return schedule
 
-    @classmethod
-    def get_all_team_schedules(cls, dataloader: DataLoader) -> dict[int, 'TeamResult']:
+    @staticmethod
+    def week_medians(schedule: list[dict]) -> dict[int, float]:
+        """Median team score of each matchup period, from a single `mMatchup` schedule"""
         def get_median(scores: list[float]):
             return sum(scores[(len(scores) // 2) - 1: (len(scores) // 2) + 1]) / 2
 
+        return {k: round(get_median(v), 2) for k, v in DataLoader.schedule_scores(schedule).items()}
+
+    @classmethod
+    def get_all_team_schedules(cls, dataloader: DataLoader) -> dict[int, 'TeamResult']:
         teams_obj = dataloader.teams()
         params = LeagueSettings(dataloader=dataloader)
         n_weeks = params.regular_season_end
         matchups_obj = dataloader.matchups()['schedule']
-        all_scores = dataloader.all_scores()
-        medians = {k: round(get_median(v), 2) for k, v in all_scores.items()}
+        medians = cls.week_medians(matchups_obj)
         schedules = {}
         for team in teams_obj['teams']:
             schedules[team['id']] = TeamResult.get_team_schedule(
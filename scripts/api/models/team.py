@@ -35,7 +35,9 @@ class Team:
             fpros: FantasyPros,
             obj: dict,
             roster_obj: dict,
-            ctx: ParseContext
+            ctx: ParseContext,
+            fp_index: dict[int, dict] | None = None,
+            slot_lookup: dict[int, int] | None = None
     ) -> 'Team':
         def get_name_obj(mgr_id: str) -> dict:
             return TEAM_IDS[mgr_id]
@@ -44,7 +46,14 @@ class Team:
         record_obj = obj.get('record', {}).get('overall', {})
         transaction_obj = obj.get('transactionCounter', {})
         roster_entry = roster_obj['entries'] if 'entries' in roster_obj else roster_obj
-        roster = Player.get_players(dataloader=dataloader, fpros=fpros, obj=roster_entry, ctx=ctx)
+        roster = Player.get_players(
+            dataloader=dataloader,
+            fpros=fpros,
+            obj=roster_entry,
+            ctx=ctx,
+            fp_index=fp_index,
+            slot_lookup=slot_lookup
+        )
 
         return Team(
             team_id=obj.get('id', None),
@@ -74,10 +83,23 @@ class Team:
             roster_obj: dict,
             ctx: ParseContext
     ) -> dict[int, 'Team']:
+        # build the lookups once and share them across every roster
+        rosters = Player.index_rosters(roster_obj)
+        fp_index = fpros.get_projection_index()
+        slot_lookup = None
+        if ctx.week:
+            slot_lookup = Player.build_lineup_slot_lookup(dataloader.teams(), dataloader.rosters())
+
         teams = {}
         for team_obj in obj['teams']:
-            roster_entry = roster_obj['teams']
-            team_roster = [r for r in roster_entry if r['id'] == team_obj['id']][0]['roster']
-            team = cls.create_team(dataloader=dataloader, fpros=fpros, obj=team_obj, roster_obj=team_roster, ctx=ctx)
+            team = cls.create_team(
+                dataloader=dataloader,
+                fpros=fpros,
+                obj=team_obj,
+                roster_obj=rosters[team_obj['id']],
+                ctx=ctx,
+                fp_index=fp_index,
+                slot_lookup=slot_lookup
+            )
             teams[team.team_id] = team
         return teams
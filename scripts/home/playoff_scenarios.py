@@ -4,7 +4,17 @@ from scripts.api.models.schedule import Matchup
 from scripts.utils.database import Database
 from scripts.utils import constants
 
-from itertools import product, combinations
+from itertools import combinations
+import hashlib
+
+from cachetools import TTLCache
+import numpy as np
+
+
+# clinch/elimination flags for every scenario and seed, keyed by (season, week, inputs digest)
+_CLINCH_CACHE = TTLCache(maxsize=16, ttl=300)
+# multi-week clinch/elimination probabilities for every seed, keyed by (season, week, n_weeks, n_sims, rng_seed, inputs digest)
+_LOOKAHEAD_CACHE = TTLCache(maxsize=16, ttl=3600)
 
 
 class PlayoffScenarios:
@@ -23,6 +33,10 @@ class PlayoffScenarios:
 
         self.standings = self._load_standings()
         self.betting_table = self._load_betting_table()
+        self.p_win = {b['team']: b['p_win'] for b in self.betting_table}
+        self.p_tophalf = {b['team']: b['p_tophalf'] for b in self.betting_table}
+        self.scenario_codes, self.scenario_p = self._encode_scenarios()
+        self.scenario_matchup, self.scenario_tophalf = self._decode_scenarios(self.scenario_codes)
         self.scenarios = self._get_scenarios()
 
     @staticmethod
@@ -32,7 +46,13 @@ class PlayoffScenarios:
 
     def _load_standings(self) -> list[dict]:
         """Load standings from database"""
-        df = Database().retrieve_data(how='season', table='matchups', season=self.season, week=self.params.as_of_week)
+        df = Database().retrieve_data(
+            how='season',
+            table='matchups',
+            season=self.season,
+            week=self.params.as_of_week,
+            columns=['week', 'team', 'score', 'matchup_result', 'tophalf_result']
+        )
         df['wins'] = df.matchup_result + df.tophalf_result
         standings = df[['team', 'score', 'wins']].groupby('team').sum().reset_index()
         standings['losses'] = (df.week.max() * 2) - standings.wins
@@ -41,17 +61,56 @@ class PlayoffScenarios:
 
     def _load_betting_table(self) -> list[dict]:
         """Load betting table from database for scenario probabilities"""
-        df = (
-            Database()
-            .retrieve_data(how='week', table='betting_table', season=self.season, week=self.params.current_week)
-            .sort_values('created').tail(self.n_teams)
+        df = Database().retrieve_data(
+            how='week',
+            table='betting_table',
+            season=self.season,
+            week=self.params.current_week,
+            columns=['team', 'matchup_id', 'p_win', 'p_tophalf'],
+            order_by=['created DESC'],
+            limit=self.n_teams  # latest simulation only
         )
-        return df[['team', 'matchup_id', 'p_win', 'p_tophalf']].to_dict(orient='records')
+        return df.to_dict(orient='records')
 
     def _teamid_to_display(self, teamid: int) -> str:
         """Convert ESPN team ID to display name"""
         return constants.TEAM_IDS[self.teams.teamid_to_primowner[teamid]]['name']['display']
 
+    def _encode_scenarios(self) -> tuple[np.ndarray, np.ndarray]:
+        """Encode every possible combination of matchup and tophalf winners as an integer
+            - high bits: h2h winners, one bit per matchup (1 = away team wins), first matchup highest
+            - low `n_teams` bits: tophalf winners, one bit per team in `team_ids` order
+        Scenarios are ordered by h2h then tophalf outcome, and impossible ones are dropped
+
+        :returns: Scenario codes and the probability of each scenario
+        """
+        n_matchups = len(self.matchups)
+        h2h = np.arange(2 ** n_matchups, dtype=np.int64)
+        h2h_outcomes = (h2h[:, None] >> np.arange(n_matchups)[::-1]) & 1
+        tophalf = np.array(
+            [sum(1 << j for j in group) for group in combinations(range(self.n_teams), self.n_teams // 2)],
+            dtype=np.int64
+        )
+        tophalf_outcomes = (tophalf[:, None] >> np.arange(self.n_teams)) & 1
+
+        # (n_h2h, n_tophalf) probability of every scenario
+        weights = np.outer(self._matchup_weights(h2h_outcomes), self._tophalf_weights(tophalf_outcomes))
+        i, j = np.nonzero(weights > 0)
+        return (h2h[i] << self.n_teams) | tophalf[j], weights[i, j]
+
+    def _decode_scenarios(self, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Matchup and tophalf wins of every team in each scenario, shape (n_scenarios, n_teams) in `team_ids` order"""
+        col = {tid: i for i, tid in enumerate(self.teams.team_ids)}
+        home = [col[hm] for hm, aw in self.matchups]
+        away = [col[aw] for hm, aw in self.matchups]
+
+        away_wins = ((codes >> self.n_teams)[:, None] >> np.arange(len(self.matchups))[::-1]) & 1
+        matchup = np.zeros((len(codes), self.n_teams), dtype=int)
+        matchup[:, home] = 1 - away_wins
+        matchup[:, away] = away_wins
+        tophalf = (codes[:, None] >> np.arange(self.n_teams)) & 1
+        return matchup, tophalf
+
     def _get_scenarios(self) -> list[dict]:
         """Calculate all possible combinations of matchup and tophalf winners
             for 10 teams:
@@ -59,70 +118,41 @@ class PlayoffScenarios:
             - n_teams choose (n_teams / 2) = 252 tophalf scenarios
             - 32 * 252 = 8064 max scenarios
         """
-        h2h_outcomes = list(product([0, 1], repeat=len(self.matchups)))
-        median_outcomes = list(combinations(self.teams.team_ids, self.n_teams // 2))
-        all_scenarios = []
-
-        for h2h in h2h_outcomes:
-            for med_winners in median_outcomes:
-                week_winners = {
-                    'matchup': {name: 0 for name in self.teams.team_ids},
-                    'tophalf': {name: 0 for name in self.teams.team_ids},
-                }
-
-                # H2H results
-                for i, (hm, aw) in enumerate(self.matchups):
-                    if h2h[i] == 0:
-                        week_winners['matchup'][hm] += 1
-                    else:
-                        week_winners['matchup'][aw] += 1
-
-                # Median results — exactly half the teams get +1
-                for name in med_winners:
-                    week_winners['tophalf'][name] += 1
-
-                all_scenarios.append(week_winners)
+        team_ids = self.teams.team_ids
+        return [
+            {
+                'matchup': dict(zip(team_ids, m)),
+                'tophalf': dict(zip(team_ids, t)),
+                'p': p
+            }
+            for m, t, p in zip(self.scenario_matchup.tolist(), self.scenario_tophalf.tolist(), self.scenario_p.tolist())
+        ]
 
-        # assign probability to each scenario and only return possible ones
-        for s in all_scenarios:
-            matchup_prob = self._matchup_weight(s)
-            tophalf_prob = self._normalized_tophalf_weight(s)
-            s['p'] = matchup_prob * tophalf_prob
+    def _matchup_weights(self, h2h_outcomes: np.ndarray) -> np.ndarray:
+        """Calculate the probability that each set of matchup winners occurs
+        Only need to find the product of the winners"""
+        p_home = np.array([self.p_win[hm] for hm, aw in self.matchups], dtype=float)
+        p_away = np.array([self.p_win[aw] for hm, aw in self.matchups], dtype=float)
+        return np.where(h2h_outcomes == 0, p_home, p_away).prod(axis=1)
 
-        return [s for s in all_scenarios if s['p'] > 0]
+    def _tophalf_normalizer(self, p_tophalf: np.ndarray) -> float:
+        """Total weight of every way to pick exactly half the teams as tophalf winners
+        Coefficient of x^(n/2) in prod(1 - p + p*x), built up one team at a time"""
+        coefs = np.zeros(len(p_tophalf) + 1)
+        coefs[0] = 1.0
+        for p in p_tophalf:
+            coefs[1:] = coefs[1:] * (1 - p) + coefs[:-1] * p
+            coefs[0] *= (1 - p)
+        return float(coefs[self.n_teams // 2])
 
-    def _matchup_weight(self, scenario: dict[str, dict]) -> float:
-        """Calculate the probability that a set of matchup winners occurs
-        Only need to find the product of the winners"""
-        matchup_set_prob = 1.0
-        for team, result in scenario['matchup'].items():
-            if result == 1:
-                winner_prob = [o for o in self.betting_table if o['team'] == team][0]['p_win']
-                matchup_set_prob *= winner_prob
-        return matchup_set_prob
-
-    def _normalized_tophalf_weight(self, scenario: dict[str, dict]) -> float:
-        """Calculate the probability that a set of tophalf winners occurs
+    def _tophalf_weights(self, tophalf_outcomes: np.ndarray) -> np.ndarray:
+        """Calculate the probability that each set of tophalf winners occurs
         Need to find the joint probability of winners and losers and normalize"""
-
-        tophalf_outcomes = combinations(self.teams.team_ids, self.n_teams // 2)
-        th_winners = tuple([t for t, r in scenario['tophalf'].items() if r == 1])
-        th_losers = tuple([t for t, r in scenario['tophalf'].items() if r == 0])
-
-        def grouping_weight(winners, losers):
-            tophalf_set_prob = 1.0
-            for t in winners:
-                tophalf_set_prob *= [b for b in self.betting_table if b['team'] == t][0]['p_tophalf']
-            for t in losers:
-                tophalf_set_prob *= (1 - [b for b in self.betting_table if b['team'] == t][0]['p_tophalf'])
-            return tophalf_set_prob
-
-        total_weight = sum(
-            grouping_weight(group, [t for t in self.teams.team_ids if t not in group])
-            for group in tophalf_outcomes
-        )
-        this_weight = grouping_weight(winners=th_winners, losers=th_losers)
-        return this_weight / total_weight if total_weight > 0 else 0.0
+        p_tophalf = np.array([self.p_tophalf[t] for t in self.teams.team_ids], dtype=float)
+        total_weight = self._tophalf_normalizer(p_tophalf)
+        if total_weight <= 0:
+            return np.zeros(len(tophalf_outcomes))
+        return np.where(tophalf_outcomes == 1, p_tophalf, 1 - p_tophalf).prod(axis=1) / total_weight
 
     def get_teams(self, standings: list[dict], seed: int) -> tuple[str, str]:
         """Calculate which teams clinched or are eliminated"""
@@ -137,48 +167,177 @@ class PlayoffScenarios:
         eliminated_tms = [k for k, v in eliminated.items() if v]
         return clinched_tms, eliminated_tms
 
+    def _inputs_digest(self, *arrays: np.ndarray) -> str:
+        """Digest of the scenarios, their probabilities, current wins and any extra `arrays`.
+        Scenarios with zero probability are dropped, so rows of cached tables line up with
+        `scenario_codes` only when every input matches"""
+        current_wins = {tm['team']: tm['wins'] for tm in self.standings}
+        digest = hashlib.blake2b(digest_size=16)
+        for a in (self.scenario_codes, self.scenario_p, [current_wins[t] for t in self.teams.team_ids], *arrays):
+            digest.update(np.ascontiguousarray(a, dtype=float).tobytes())
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    def _clinch_table(self) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """Clinched and eliminated flags of every team in every scenario, for every seed in one pass.
+        Cached per (season, week) and digest of the scenarios and standings, since the betting table
+        can be re-simulated within a week
+
+        :returns: {seed: (clinched, eliminated)}, each of shape (n_scenarios, n_teams) in `team_ids` order
+        """
+        key = (self.season, self.params.current_week, self._inputs_digest())
+        if key not in _CLINCH_CACHE:
+            current_wins = {tm['team']: tm['wins'] for tm in self.standings}
+            base = np.array([current_wins[t] for t in self.teams.team_ids], dtype=float)
+            wins = base + self.scenario_matchup + self.scenario_tophalf
+            ranked = -np.sort(-wins, axis=1)  # wins in standings order
+            max_gain = (self.params.regular_season_end - (self.params.as_of_week + 1)) * 2  # 2 results per week
+
+            _CLINCH_CACHE[key] = {
+                seed: (
+                    wins - ranked[:, [seed]] > max_gain,
+                    ranked[:, [seed-1]] - wins > max_gain  # -1 to get team in that seed
+                )
+                for seed in range(1, self.n_teams)
+            }
+        return _CLINCH_CACHE[key]
+
     def get_new_clinches(self, seed: int) -> list[dict]:
         """Calculate new clinching and elimination scenarios based on the current/upcoming week"""
         clinched, eliminated = self.get_teams(standings=self.standings, seed=seed)
-        results = {
-            name: {
-                'clinched': 0,
-                'eliminated': 0,
-                'p_clinch': 0,
-                'p_elim': 0,
-                'clinch_scenarios': [],
-                'elim_scenarios': []
+        new_clinched, new_elim = self._clinch_table()[seed]
+        results = {}
+        for j, tm in enumerate(self.teams.team_ids):
+            clinch_idx = np.flatnonzero(new_clinched[:, j]) if tm not in clinched else np.array([], dtype=int)
+            elim_idx = np.flatnonzero(new_elim[:, j]) if tm not in eliminated else np.array([], dtype=int)
+            if len(clinch_idx) or len(elim_idx):
+                results[tm] = {
+                    'clinched': len(clinch_idx),
+                    'eliminated': len(elim_idx),
+                    'p_clinch': float(self.scenario_p[clinch_idx].sum()),
+                    'p_elim': float(self.scenario_p[elim_idx].sum()),
+                    'clinch_scenarios': [self.scenarios[i] for i in clinch_idx],
+                    'elim_scenarios': [self.scenarios[i] for i in elim_idx]
+                }
+        return results
+
+    def _future_wins(self, weeks: list[int], n_sims: int, rng: np.random.Generator) -> np.ndarray:
+        """Simulate wins added over future weeks, shape (n_sims, n_teams) in `team_ids` order
+        Each team's weekly performance is logit(p_tophalf) plus logistic noise: the top half goes to
+        the best n_teams / 2 performances and each matchup to the better of the two teams"""
+        team_ids = self.teams.team_ids
+        col = {tid: i for i, tid in enumerate(team_ids)}
+        season_matchups = Matchup.get_season_matchups(params=self.params)
+
+        p = np.clip([self.p_tophalf[t] for t in team_ids], 1e-6, 1 - 1e-6)
+        strength = np.log(p / (1 - p))
+        wins = np.zeros((n_sims, self.n_teams))
+        for week in weeks:
+            perf = strength + rng.logistic(size=(n_sims, self.n_teams))
+            wins += perf.argsort(axis=1).argsort(axis=1) >= self.n_teams - self.n_teams // 2
+
+            pairs = [tuple(m.teams) for m in season_matchups[week] if len(m.teams) == 2]
+            home = [col[hm] for hm, aw in pairs]
+            away = [col[aw] for hm, aw in pairs]
+            wins[:, home] += perf[:, home] > perf[:, away]
+            wins[:, away] += perf[:, away] > perf[:, home]
+        return wins
+
+    def _lookahead_table(
+            self,
+            n_weeks: int,
+            n_sims: int,
+            rng_seed: int | None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Clinch and elimination probabilities of every team for every seed after `n_weeks` more weeks
+        The current week is enumerated exactly, scenarios leading to the same wins are merged,
+        and each distinct outcome is followed by `n_sims` simulations of the later weeks
+
+        A team clinches seed s if at most s teams (itself included) are within `max_gain` wins of it,
+        and is eliminated if at least s teams are more than `max_gain` wins ahead, so one count per team
+        covers every seed
+
+        Cached per digest of the scenarios, standings and win probabilities, which later weeks are simulated from
+
+        :returns: p_clinch and p_elim, each of shape (n_teams - 1, n_teams) with row `seed - 1`
+        """
+        digest = self._inputs_digest(
+            [self.p_win[t] for t in self.teams.team_ids],
+            [self.p_tophalf[t] for t in self.teams.team_ids]
+        )
+        key = (self.season, self.params.current_week, n_weeks, n_sims, rng_seed, digest)
+        if key not in _LOOKAHEAD_CACHE:
+            current_wins = {tm['team']: tm['wins'] for tm in self.standings}
+            base = np.array([current_wins[t] for t in self.teams.team_ids], dtype=float)
+            states, inverse = np.unique(
+                base + self.scenario_matchup + self.scenario_tophalf,
+                axis=0,
+                return_inverse=True
+            )
+            state_p = np.bincount(inverse.ravel(), weights=self.scenario_p, minlength=len(states))
+
+            first_future = self.params.as_of_week + 2
+            wins = np.repeat(states, n_sims, axis=0) + self._future_wins(
+                weeks=list(range(first_future, first_future + n_weeks - 1)),
+                n_sims=len(states) * n_sims,
+                rng=np.random.default_rng(rng_seed)
+            )
+            weights = np.repeat(state_p / n_sims, n_sims)
+            max_gain = (self.params.regular_season_end - (self.params.as_of_week + n_weeks)) * 2
+
+            n_bins = self.n_teams + 1
+            offset = np.arange(self.n_teams) * n_bins
+            clinch_hist = np.zeros(self.n_teams * n_bins)
+            elim_hist = np.zeros(self.n_teams * n_bins)
+            chunk = 50_000
+            for start in range(0, len(wins), chunk):
+                w = wins[start:start + chunk]
+                p = np.broadcast_to(weights[start:start + chunk, None], w.shape).ravel()
+                within = (w[:, None, :] >= w[:, :, None] - max_gain).sum(axis=2)
+                ahead = (w[:, None, :] > w[:, :, None] + max_gain).sum(axis=2)
+                clinch_hist += np.bincount((within + offset).ravel(), weights=p, minlength=len(clinch_hist))
+                elim_hist += np.bincount((ahead + offset).ravel(), weights=p, minlength=len(elim_hist))
+
+            clinch_cdf = clinch_hist.reshape(self.n_teams, n_bins).cumsum(axis=1)
+            elim_cdf = elim_hist.reshape(self.n_teams, n_bins).cumsum(axis=1)
+            seeds = np.arange(1, self.n_teams)
+            p_clinch = clinch_cdf[:, seeds].T
+            p_elim = (elim_cdf[:, [-1]] - elim_cdf[:, seeds - 1]).T
+            _LOOKAHEAD_CACHE[key] = (p_clinch, p_elim)
+        return _LOOKAHEAD_CACHE[key]
+
+    def get_lookahead_clinches(
+            self,
+            seed: int,
+            n_weeks: int = 2,
+            n_sims: int = 32,
+            rng_seed: int | None = 0
+    ) -> dict[int, dict]:
+        """Calculate new clinching and elimination probabilities over the next `n_weeks` weeks,
+        the current/upcoming week included. Later weeks are simulated from `betting_table` tophalf probabilities
+
+        :param seed: Seed to calculate probabilities for (2=BYE week, 5=playoffs by wins)
+        :param n_weeks: Number of weeks to look ahead, capped at the end of the regular season
+        :param n_sims: Simulations of the weeks after the current one, per distinct current week outcome
+        :param rng_seed: Seed for the simulations so page builds are stable. None for fresh draws
+        :returns: {team: {'p_clinch', 'p_elim'}} for teams that can newly clinch or be eliminated
+        """
+        n_weeks = min(n_weeks, self.params.regular_season_end - self.params.as_of_week)
+        if n_weeks <= 1:
+            return {
+                tm: {'p_clinch': r['p_clinch'], 'p_elim': r['p_elim']}
+                for tm, r in self.get_new_clinches(seed=seed).items()
             }
-            for name in self.teams.team_ids
-        }
-        for s in self.scenarios:
-            new_standings = []
-            for team in self.standings:
-                name = team['team']
-                new_wins = team['wins'] + s['matchup'][team['team']] + s['tophalf'][team['team']]
-                new_standings.append({
-                    'team': name,
-                    'wins': new_wins,
-                    'losses': ((self.params.as_of_week + 1) * 2) - new_wins,  # losses after the current week
-                    'score': round(team['score'], 2),  # points don't change for scenario purposes
-                })
-
-            # re-sort standings for clinches
-            new_standings.sort(key=lambda x: [x['wins'], x['score']], reverse=True)
-
-            new_clinched, new_elim = self.get_teams(standings=new_standings, seed=seed)
-            new_clinched = [t for t in new_clinched if t not in clinched]
-            new_elim = [t for t in new_elim if t not in eliminated]
-            for tm in self.teams.team_ids:
-                if tm in new_clinched:
-                    results[tm]['clinched'] += 1
-                    results[tm]['p_clinch'] += s['p']
-                    results[tm]['clinch_scenarios'].append(s)
-                if tm in new_elim:
-                    results[tm]['eliminated'] += 1
-                    results[tm]['p_elim'] += s['p']
-                    results[tm]['elim_scenarios'].append(s)
-        return {k: v for k, v in results.items() if v['clinched'] > 0 or v['eliminated'] > 0}
+
+        clinched, eliminated = self.get_teams(standings=self.standings, seed=seed)
+        p_clinch, p_elim = self._lookahead_table(n_weeks=n_weeks, n_sims=n_sims, rng_seed=rng_seed)
+        results = {}
+        for j, tm in enumerate(self.teams.team_ids):
+            p_c = 0.0 if tm in clinched else float(p_clinch[seed-1, j])
+            p_e = 0.0 if tm in eliminated else float(p_elim[seed-1, j])
+            if p_c > 0 or p_e > 0:
+                results[tm] = {'p_clinch': p_c, 'p_elim': p_e}
+        return results
 
     def team_magic_number(self, team: int, playoff_spots: int) -> int | None:
         """Calculate magic number to clinch"""
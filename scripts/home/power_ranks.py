@@ -1,7 +1,7 @@
 import numpy as np
 import math
 
-from scripts.utils.database import Database
+from scripts.utils.database import Database, TableQuery
 from scripts.api.settings import LeagueSettings, TeamSettings
 
 
@@ -66,12 +66,16 @@ def power_rank(params: LeagueSettings,
     consistency_factor = 1 if week >= 5 else week / 5  # increase by 20% each week
 
     # load data from db
-    db = Database()
-    season_sim = db.retrieve_data(how='week', table='season_sim', season=season, week=week+1)
-    eff = db.retrieve_data(how='season', table='efficiency', season=season, week=week)
-    h2h = db.retrieve_data(how='season', table='h2h', season=season, week=week)
-    ss = db.retrieve_data(how='season', table='schedule_switcher', season=season, week=week)
-    matchups = db.retrieve_data(how='season', table='matchups', season=season, week=week)
+    data = Database().retrieve_many([
+        TableQuery(table='season_sim', how='week', season=season, week=week+1, columns=('team', 'total_points')),
+        TableQuery(table='efficiency', how='season', season=season, week=week, columns=('team', 'actual_lineup_score', 'optimal_lineup_score')),
+        TableQuery(table='h2h', how='season', season=season, week=week, columns=('team', 'result')),
+        TableQuery(table='schedule_switcher', how='season', season=season, week=week, columns=('team', 'schedule_of', 'result')),
+        TableQuery(table='matchups', how='season', season=season, week=week, columns=('week', 'team', 'score', 'matchup_result', 'tophalf_result')),
+    ])
+    season_sim, eff, h2h, ss, matchups = (
+        data['season_sim'], data['efficiency'], data['h2h'], data['schedule_switcher'], data['matchups']
+    )
     matchups = matchups[matchups.week <= params.regular_season_end]
     matchups['median'] = matchups.groupby('week')['score'].transform('median')
 
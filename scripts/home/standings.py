@@ -377,10 +377,23 @@ class Standings:
             'elims': elim_rows
         }
 
+    def get_lookahead_clinches(self, id_map: dict, n_weeks: int = 2) -> list[list]:
+        """
+        Formatter for bye and playoff clinch/elimination probabilities over the next `n_weeks` weeks
+        :returns: Rows of team, scenario (bye or playoffs), clinch probability and elimination probability
+        """
+        rows = []
+        for seed in [2, 5]:
+            clinch_type = 'Bye' if seed == 2 else 'Top 5'
+            for team, p in self.playoff_scenarios.get_lookahead_clinches(seed=seed, n_weeks=n_weeks).items():
+                rows.append([id_map[team], clinch_type, self.format_prob(p['p_clinch']), self.format_prob(p['p_elim'])])
+        rows.sort(key=lambda x: (x[0], x[1]))
+        return rows
+
     def final_week_playoff_scenarios(self, seed: int):
         from scripts.utils.database import Database
         db = Database()
-        sim_ranks = db.retrieve_data(table='season_sim_ranks', how='week', season=self.season, week=self.week)
+        sim_ranks = db.retrieve_data(table='season_sim_ranks', how='week', season=self.season, week=self.week, columns=['team', 'ranks', 'p'])
         if sim_ranks.empty:
             pass  # run season simulation
 
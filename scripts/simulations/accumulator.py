@@ -0,0 +1,85 @@
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import numpy as np
+
+
+@dataclass
+class SeasonAccumulator:
+    """
+    Running totals for season simulations. Memory is O(teams x wins) no matter how many simulations are added
+
+    Attributes:
+        team_ids: Team ID of each column
+        max_wins: Most total wins a team can finish the regular season with
+        n_sims: Number of simulations added so far
+        totals: Per-team sums of each counter in `COUNTERS`
+        wins_hist: Number of simulations ending with each whole win total, shape (n_teams, max_wins + 1)
+        seed_hist: Number of simulations ending in each seed, shape (n_teams, n_teams)
+    """
+    COUNTERS: ClassVar[tuple[str, ...]] = (
+        'seed', 'matchup_wins', 'tophalf_wins', 'total_wins', 'total_points', 'most_wins', 'most_points',
+        'top_scores', 'playoffs', 'third', 'finals', 'champion'
+    )
+
+    team_ids: list[int]
+    max_wins: int
+    n_sims: int = 0
+    totals: dict[str, np.ndarray] = field(init=False)
+    wins_hist: np.ndarray = field(init=False)
+    seed_hist: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        n_teams = len(self.team_ids)
+        self.totals = {k: np.zeros(n_teams) for k in self.COUNTERS}
+        self.wins_hist = np.zeros((n_teams, self.max_wins + 1), dtype=np.int64)
+        self.seed_hist = np.zeros((n_teams, n_teams), dtype=np.int64)
+
+    def update(self, **counters: np.ndarray) -> None:
+        """
+        Add a batch of simulations
+
+        Args:
+            **counters: One array of shape (n_sims, n_teams) for every name in `COUNTERS`.
+                `seed` holds each team's final seed, starting at 1
+        """
+        for k in self.COUNTERS:
+            self.totals[k] += counters[k].sum(axis=0)
+        self.n_sims += len(counters['seed'])
+
+        total_wins = counters['total_wins']
+        whole_wins = total_wins == np.floor(total_wins)
+        for i in range(len(self.team_ids)):
+            self.wins_hist[i] += np.bincount(total_wins[whole_wins[:, i], i].astype(int), minlength=self.max_wins + 1)
+            self.seed_hist[i] += np.bincount(counters['seed'][:, i].astype(int) - 1, minlength=len(self.team_ids))
+
+    def merge(self, other: 'SeasonAccumulator') -> 'SeasonAccumulator':
+        """Combine two accumulators into a new one"""
+        merged = SeasonAccumulator(team_ids=self.team_ids, max_wins=self.max_wins, n_sims=self.n_sims + other.n_sims)
+        merged.totals = {k: self.totals[k] + other.totals[k] for k in self.COUNTERS}
+        merged.wins_hist = self.wins_hist + other.wins_hist
+        merged.seed_hist = self.seed_hist + other.seed_hist
+        return merged
+
+    def means(self) -> dict[int, dict[str, float]]:
+        """Average of each counter per simulation, by team ID"""
+        return {
+            tid: {k: float(v[i]) / self.n_sims for k, v in self.totals.items()}
+            for i, tid in enumerate(self.team_ids)
+        }
+
+    def win_probs(self) -> list[tuple[int, int, float]]:
+        """(team, wins, p) for every win total reached in at least one simulation"""
+        return [
+            (tid, wins, int(n) / self.n_sims)
+            for i, tid in enumerate(self.team_ids)
+            for wins, n in enumerate(self.wins_hist[i]) if n > 0
+        ]
+
+    def seed_probs(self) -> list[tuple[int, int, float]]:
+        """(team, seed, p) for every seed reached in at least one simulation"""
+        return [
+            (tid, seed, int(n) / self.n_sims)
+            for i, tid in enumerate(self.team_ids)
+            for seed, n in enumerate(self.seed_hist[i], start=1) if n > 0
+        ]
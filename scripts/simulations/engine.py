@@ -0,0 +1,258 @@
+from scripts.utils import constants
+
+import numpy as np
+import scipy.special as sc
+
+
+class ScoreBank:
+    """
+    Bank of unit-scale gamma quantiles for each position, rescaled by projection to draw truncated gamma scores.
+    Quantiles are computed once per position and truncation points once per (position, projection),
+    so repeated draws across weeks and simulators never call the gamma ppf
+    """
+    def __init__(self, gamma_map: dict = constants.GAMMA_VALUES, size: int = 2**16):
+        """
+        Args:
+            gamma_map: Gamma parameters by position ID
+            size: Number of quantiles stored per position
+        """
+        self.gamma_map = gamma_map
+        self.size = size
+        self._quantiles = {}
+        self._truncation = {}
+
+    def quantiles(self, position_id: int) -> np.ndarray:
+        """Evenly spaced quantiles of the position's unit-scale gamma distribution"""
+        if position_id not in self._quantiles:
+            shape = self.gamma_map[position_id]['shape']
+            self._quantiles[position_id] = sc.gammaincinv(shape, (np.arange(self.size) + 0.5) / self.size)
+        return self._quantiles[position_id]
+
+    def truncation(self, position_id: int, projection: float) -> tuple[float, float]:
+        """Gamma scale for a projection and the cdf at the position's max score"""
+        key = (position_id, projection)
+        if key not in self._truncation:
+            gamma_values = self.gamma_map[position_id]
+            scale = projection / gamma_values['shape']
+            cdf_max = sc.gammainc(gamma_values['shape'], gamma_values['max'] / scale) if scale > 0 else 1.0
+            self._truncation[key] = (scale, float(cdf_max))
+        return self._truncation[key]
+
+    def sample(
+            self,
+            rng: np.random.Generator,
+            position_ids: np.ndarray,
+            projections: np.ndarray,
+            n_sims: int,
+    ) -> np.ndarray:
+        """
+        Draw simulated player scores from a gamma distribution truncated at each position's max
+
+        Args:
+            rng: Random generator to draw from
+            position_ids: ESPN position ID of each player
+            projections: Projected points of each player, used to set the gamma scale
+            n_sims: Number of simulations to draw
+
+        Returns:
+            Array of shape (n_sims, n_players)
+        """
+        positions = sorted(set(position_ids))
+        table = np.stack([self.quantiles(p) for p in positions]) if positions else np.zeros((0, self.size))
+        rows = np.array([positions.index(p) for p in position_ids], dtype=np.intp)
+        scale, cdf_max = np.array(
+            [self.truncation(p, proj) for p, proj in zip(position_ids, projections)], dtype=float
+        ).reshape(-1, 2).T
+
+        max_val = np.array([self.gamma_map[p]['max'] for p in position_ids], dtype=float)
+
+        idx = (rng.random((n_sims, len(rows))) * (cdf_max * self.size)).astype(np.intp)
+        return np.minimum(table[rows, idx] * scale, max_val)  # last quantile bin can straddle the max
+
+
+def team_scores(
+        player_scores: np.ndarray,
+        team_idx: np.ndarray,
+        locked_points: np.ndarray,
+) -> np.ndarray:
+    """
+    Sum simulated player scores into team scores
+
+    Args:
+        player_scores: Simulated scores of shape (n_sims, n_players)
+        team_idx: Column index of each player's team
+        locked_points: Points already scored by each team's locked players
+
+    Returns:
+        Array of shape (n_sims, n_teams)
+    """
+    membership = np.zeros((player_scores.shape[1], len(locked_points)))
+    membership[np.arange(len(team_idx)), team_idx] = 1.0
+    return player_scores @ membership + locked_points
+
+
+def matchup_results(
+        scores: np.ndarray,
+        home_idx: np.ndarray,
+        away_idx: np.ndarray,
+) -> np.ndarray:
+    """
+    Matchup result values (1 win, 0.5 tie, 0 loss) for every team in every simulation.
+    Teams not in `home_idx` or `away_idx` (byes) are 0
+
+    Returns:
+        Array of shape (n_sims, n_teams)
+    """
+    home, away = scores[:, home_idx], scores[:, away_idx]
+    results = np.zeros_like(scores)
+    results[:, home_idx] = (home > away) + 0.5 * (home == away)
+    results[:, away_idx] = (away > home) + 0.5 * (home == away)
+    return results
+
+
+def tophalf_results(scores: np.ndarray) -> np.ndarray:
+    """
+    Top half result values (1 above the median, 0.5 at the median, 0 below) for every team in every simulation
+
+    Returns:
+        Array of shape (n_sims, n_teams)
+    """
+    midpoint = scores.shape[1] // 2
+    ordered = np.sort(scores, axis=1)
+    median = ordered[:, midpoint-1:midpoint+1].mean(axis=1, keepdims=True)
+    return (scores > median) + 0.5 * (scores == median)
+
+
+def week_summary(
+        scores: np.ndarray,
+        home_idx: np.ndarray,
+        away_idx: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Summarize simulated scores for a single week. Only teams with an opponent are counted
+
+    Args:
+        scores: Simulated team scores of shape (n_sims, n_teams)
+        home_idx: Column index of the home team in each matchup
+        away_idx: Column index of the away team in each matchup
+
+    Returns:
+        Per-team totals across all simulations for `scores`, `n_wins`, `n_tophalf`, `n_highest` and `n_lowest`
+    """
+    playing = np.concatenate([home_idx, away_idx])
+    summary = {k: np.zeros(scores.shape[1]) for k in ['scores', 'n_wins', 'n_tophalf', 'n_highest', 'n_lowest']}
+
+    active = scores[:, playing]
+    summary['scores'][playing] = active.sum(axis=0)
+    summary['n_wins'] = matchup_results(scores, home_idx, away_idx).sum(axis=0)
+    summary['n_tophalf'][playing] = tophalf_results(active).sum(axis=0)
+    summary['n_highest'][playing] = (active == active.max(axis=1, keepdims=True)).sum(axis=0)
+    summary['n_lowest'][playing] = (active == active.min(axis=1, keepdims=True)).sum(axis=0)
+    return summary
+
+
+def final_standings(
+        total_wins: np.ndarray,
+        total_points: np.ndarray,
+        playoff_teams: int,
+        wild_card: bool = True,
+) -> np.ndarray:
+    """
+    Order teams by final standings (top seeds by wins then points, last playoff seed by points)
+
+    Args:
+        total_wins: Season wins of shape (n_sims, n_teams)
+        total_points: Season points of shape (n_sims, n_teams)
+        playoff_teams: Number of playoff teams
+        wild_card: True (default) if league uses a wild card for the last playoff spot earned by total points
+
+    Returns:
+        Team column index in seed order, shape (n_sims, n_teams)
+    """
+    order = np.lexsort((-total_points, -total_wins), axis=-1)
+    if not wild_card:
+        return order
+
+    n_sims = len(order)
+    rows = np.arange(n_sims)[:, None]
+    top = order[:, :playoff_teams-1]
+    remaining_points = total_points.astype(float)
+    remaining_points[rows, top] = -np.inf
+    wc = remaining_points.argmax(axis=1)[:, None]
+    bottom = order[:, playoff_teams-1:]
+    bottom = bottom[bottom != wc].reshape(n_sims, -1)
+    return np.concatenate([top, wc, bottom], axis=1)
+
+
+def seed_sort(teams: np.ndarray, seeds: np.ndarray) -> np.ndarray:
+    """Sort each row of team columns by seed"""
+    rows = np.arange(len(teams))[:, None]
+    return np.take_along_axis(teams, np.argsort(seeds[rows, teams], axis=1), axis=1)
+
+
+def play_pairs(
+        scores: np.ndarray,
+        home: np.ndarray,
+        away: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decide playoff games. The higher score advances, ties go to the home (higher seeded) team
+
+    Args:
+        scores: Simulated team scores of shape (n_sims, n_teams)
+        home: Home team columns of shape (n_sims, n_games)
+        away: Away team columns of shape (n_sims, n_games)
+
+    Returns:
+        Winning and losing team columns, each of shape (n_sims, n_games)
+    """
+    rows = np.arange(len(scores))[:, None]
+    home_wins = scores[rows, home] >= scores[rows, away]
+    return np.where(home_wins, home, away), np.where(home_wins, away, home)
+
+
+def playoff_round(
+        scores: np.ndarray,
+        bracket: np.ndarray,
+        seeds: np.ndarray,
+        points: np.ndarray,
+        n_bye: int = 0,
+) -> np.ndarray:
+    """
+    Simulate a playoff round. The top remaining seed plays the lowest scoring team (by season points)
+    and the remaining teams play each other
+
+    Args:
+        scores: Simulated team scores for the week, shape (n_sims, n_teams)
+        bracket: Team columns still alive in seed order, shape (n_sims, k)
+        seeds: Final seed of each team, shape (n_sims, n_teams)
+        points: Regular season points of each team, shape (n_sims, n_teams)
+        n_bye: Number of top seeds advancing without playing
+
+    Returns:
+        Team columns advancing in seed order
+    """
+    n_sims = len(bracket)
+    rows = np.arange(n_sims)[:, None]
+    byes, playing = bracket[:, :n_bye], bracket[:, n_bye:]
+    chooser, others = playing[:, :1], playing[:, 1:]
+    opp = np.take_along_axis(others, np.argmin(points[rows, others], axis=1)[:, None], axis=1)
+    rest = others[others != opp].reshape(n_sims, -1)
+
+    home = np.concatenate([chooser, rest[:, 0::2]], axis=1)
+    away = np.concatenate([opp, rest[:, 1::2]], axis=1)
+    winners, _ = play_pairs(scores=scores, home=home, away=away)
+    return seed_sort(np.concatenate([byes, winners], axis=1), seeds)
+
+
+def team_mask(teams: np.ndarray, n_teams: int) -> np.ndarray:
+    """Indicator of shape (n_sims, n_teams) for the team columns in each row of `teams`"""
+    mask = np.zeros((len(teams), n_teams))
+    mask[np.arange(len(teams))[:, None], teams] = 1.0
+    return mask
+
+
+def split_leaders(values: np.ndarray) -> np.ndarray:
+    """Each team's share of the lead in each simulation, with ties split evenly"""
+    leaders = values == values.max(axis=1, keepdims=True)
+    return leaders / leaders.sum(axis=1, keepdims=True)
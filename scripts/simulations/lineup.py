@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+
+from scripts.api.models.player import Player
+from scripts.simulations import engine
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class WeekLineups:
+    """
+    Every team's starting lineup for a single week, stored as one array per field with one entry per starter.
+    Built once from `Player` objects and consumed directly by the simulation engine
+
+    Attributes:
+        team_ids: Team ID of each score column
+        player_ids: ESPN player ID of each starter (negative for free agent fill-ins)
+        position_ids: ESPN position ID of each starter
+        projections: Projected points of each starter, FantasyPros first then ESPN
+        team_idx: Score column of each starter's team
+        is_locked: True if the starter has already played
+        pts_act: Actual points of each starter, 0 if not locked
+    """
+    team_ids: tuple[int, ...]
+    player_ids: np.ndarray
+    position_ids: np.ndarray
+    projections: np.ndarray
+    team_idx: np.ndarray
+    is_locked: np.ndarray
+    pts_act: np.ndarray
+
+    @classmethod
+    def from_players(
+            cls,
+            lineups: dict[int, list[Player]],
+            team_ids: list[int]
+    ) -> 'WeekLineups':
+        """
+        Pack best projected lineups into arrays
+
+        Args:
+            lineups: Best projected lineup for each team
+            team_ids: Team IDs in score column order
+        """
+        rows = [
+            (p.id, p.position_id, p.pts_proj_fp or p.pts_proj or 0.0, i, p.is_locked, p.pts_act or 0.0)
+            for i, tid in enumerate(team_ids)
+            for p in lineups.get(tid, [])
+        ]
+        player_ids, position_ids, projections, team_idx, is_locked, pts_act = zip(*rows) if rows else [()] * 6
+        return cls(
+            team_ids=tuple(team_ids),
+            player_ids=np.array(player_ids, dtype=np.int64),
+            position_ids=np.array(position_ids, dtype=int),
+            projections=np.array(projections, dtype=float),
+            team_idx=np.array(team_idx, dtype=int),
+            is_locked=np.array(is_locked, dtype=bool),
+            pts_act=np.array(pts_act, dtype=float)
+        )
+
+    @property
+    def locked_points(self) -> np.ndarray:
+        """Points already scored by each team's locked starters"""
+        return np.bincount(
+            self.team_idx[self.is_locked],
+            weights=self.pts_act[self.is_locked],
+            minlength=len(self.team_ids)
+        )
+
+    def simulate(
+            self,
+            score_bank: engine.ScoreBank,
+            rng: np.random.Generator,
+            n_sims: int
+    ) -> np.ndarray:
+        """
+        Simulate every team's score for the week
+
+        Args:
+            score_bank: Bank to draw player scores from
+            rng: Random generator to draw from
+            n_sims: Number of simulations to draw
+
+        Returns:
+            Array of shape (n_sims, n_teams), columns in `team_ids` order
+        """
+        to_play = ~self.is_locked
+        player_scores = score_bank.sample(
+            rng=rng,
+            position_ids=self.position_ids[to_play],
+            projections=self.projections[to_play],
+            n_sims=n_sims
+        )
+        return engine.team_scores(
+            player_scores=player_scores,
+            team_idx=self.team_idx[to_play],
+            locked_points=self.locked_points
+        )
@@ -0,0 +1,77 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Callable
+
+import numpy as np
+
+
+_WORKER = {}
+
+
+def _init_worker(fn: Callable, kwargs: dict) -> None:
+    """Store the simulation function once per worker process instead of pickling it with every shard"""
+    _WORKER['fn'] = fn
+    _WORKER['kwargs'] = kwargs
+
+
+def _run_shard(shard: tuple[int, np.random.SeedSequence]):
+    n_sims, seed_seq = shard
+    return _WORKER['fn'](n_sims=n_sims, rng=np.random.default_rng(seed_seq), **_WORKER['kwargs'])
+
+
+def merge_results(a, b):
+    """
+    Add two sets of simulation counters together. Accumulators are merged with their own `merge`
+    and nested dictionaries are merged key by key
+    """
+    if hasattr(a, 'merge'):
+        return a.merge(b)
+
+    merged = {}
+    for k, v in a.items():
+        if isinstance(v, dict):
+            merged[k] = merge_results(v, b[k])
+        else:
+            merged[k] = v + b[k]
+    return merged
+
+
+def run_sharded(
+        fn: Callable,
+        n_sims: int,
+        seed: int | None = None,
+        n_workers: int | None = None,
+        shard_size: int = 10_000,
+        **kwargs
+):
+    """
+    Split `n_sims` into fixed size shards, run them across a process pool and merge the counters.
+    Each shard draws from its own child of `SeedSequence(seed)`, and shards are merged in order,
+    so results are identical for a given seed regardless of the number of workers
+
+    Args:
+        fn: Simulation function accepting `n_sims` and `rng` keyword arguments and returning counters,
+            e.g. `Simulation.simulate_week` or `Simulation.simulate_full_season_batched`
+        n_sims: Total number of simulations to run
+        seed: Master seed. None draws fresh entropy
+        n_workers: Number of worker processes. Defaults to the number of CPUs, 1 runs in process
+        shard_size: Number of simulations per shard
+        **kwargs: Passed through to `fn`
+
+    Returns:
+        Counters summed across all shards
+    """
+    shards = [shard_size] * (n_sims // shard_size)
+    if n_sims % shard_size:
+        shards.append(n_sims % shard_size)
+    seed_seq = np.random.SeedSequence(seed)
+    print(f'Running {n_sims} simulations in {len(shards)} shards (seed entropy {seed_seq.entropy})')
+    shards = list(zip(shards, seed_seq.spawn(len(shards))))
+
+    if n_workers == 1:
+        _init_worker(fn=fn, kwargs=kwargs)
+        parts = [_run_shard(s) for s in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(fn, kwargs)) as executor:
+            parts = list(executor.map(_run_shard, shards))
+    return reduce(merge_results, parts)
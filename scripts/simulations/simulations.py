@@ -3,7 +3,6 @@ from scripts.api.fantasy_pros import FantasyPros
 from scripts.api.models.schedule import (
     Result,
     Matchup,
-    GameType,
     TeamResult
 )
 from scripts.api.models.team import Team
@@ -17,9 +16,12 @@ from scripts.api.settings import (
     RosterSettings,
     TeamSettings
 )
+from scripts.simulations import engine
+from scripts.simulations.accumulator import SeasonAccumulator
+from scripts.simulations.lineup import WeekLineups
 from scripts.utils import constants
 
-import scipy.stats as st
+import numpy as np
 
 
 class Simulation:
@@ -48,14 +50,20 @@ class Simulation:
         self.midpoint = self.league_size // 2
         self.playoff_teams = self.league_settings.playoff_teams
         self.gamma_map = constants.GAMMA_VALUES
+        self.score_bank = engine.ScoreBank(gamma_map=self.gamma_map)
 
 
-    def simulate_week(self, n_sims: int) -> dict[str, dict]:
+    def simulate_week(
+            self,
+            n_sims: int,
+            rng: np.random.Generator | None = None
+    ) -> dict[str, dict]:
         """
         Simulate a week `n` times and calculate number of occurrences for each category below
 
         Args:
-            n: Number of simulations to run
+            n_sims: Number of simulations to run
+            rng: Random generator to draw scores from. Defaults to a fresh, unseeded generator
 
         Returns:
             Dictionary containing simulation results. For each team,
@@ -65,155 +73,250 @@ class Simulation:
                 - `n_highest`: number of times with the highest score
                 - `n_lowest`: number of times with the lowest score`
         """
-        lineups = {k: self._get_best_lineup(v, n_sims=n_sims) for k, v in self.teams.items()}
-
-        # initialize counters
-        results = {
-            'scores': {key: 0 for key in self.teams},
-            'n_wins': {key: 0 for key in self.teams},
-            'n_tophalf': {key: 0 for key in self.teams},
-            'n_highest': {key: 0 for key in self.teams},
-            'n_lowest': {key: 0 for key in self.teams},
+        rng = rng or np.random.default_rng()
+        team_ids = list(self.teams)
+        lineup = WeekLineups.from_players(
+            lineups={k: self._get_best_lineup(v) for k, v in self.teams.items()},
+            team_ids=team_ids
+        )
+
+        scores = lineup.simulate(score_bank=self.score_bank, rng=rng, n_sims=n_sims)
+
+        home_idx, away_idx = self._matchup_index(week=self.league_settings.current_week, team_ids=team_ids)
+        summary = engine.week_summary(scores=scores, home_idx=home_idx, away_idx=away_idx)
+        return {
+            k: dict(zip(team_ids, v.tolist()))
+            for k, v in summary.items()
         }
 
-        for sim in range(n_sims):
-            if sim % 1000 == 0:
-                print(f'{sim+1}/{n_sims}', end='\r')
-            matchup_sim = self._simulate_matchups(lineups=lineups)
-
-            scores = sorted(m.team_score for m in matchup_sim)
-            max_score = max(scores)
-            min_score = min(scores)
-            median_score = sum(scores[self.midpoint-1 : self.midpoint+1]) / 2
-            for team in matchup_sim:
-                results['scores'][team.team_id] += team.team_score
-                results['n_wins'][team.team_id] += team.matchup_result.value
-                results['n_tophalf'][team.team_id] += (
-                    Result.WIN.value if team.team_score > median_score
-                    else Result.LOSS.value if team.team_score < median_score
-                    else Result.TIE.value
-                )
-                results['n_highest'][team.team_id] += 1 if team.team_score == max_score else 0
-                results['n_lowest'][team.team_id] += 1 if team.team_score == min_score else 0
-
-        return results
+    def _matchup_index(
+            self,
+            week: int,
+            team_ids: list[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Column index of the home and away teams for each of a week's matchups. Byes are dropped
+        """
+        col = {tid: i for i, tid in enumerate(team_ids)}
+        pairs = [list(m.teams) for m in self.matchups[week] if len(m.teams) == 2]
+        home_idx = np.array([col[p[0]] for p in pairs], dtype=int)
+        away_idx = np.array([col[p[1]] for p in pairs], dtype=int)
+        return home_idx, away_idx
 
-    def simulate_full_season(
+    def simulate_full_season_batched(
             self,
             results: dict[int, dict],
             n_sims: int,
-    ) -> list[dict]:
+            rng: np.random.Generator | None = None,
+            lineups: dict[int, WeekLineups] | None = None,
+            accumulator: SeasonAccumulator | None = None,
+            chunk_size: int = 10_000
+    ) -> SeasonAccumulator:
         """
-        Simulate a full regular season + playoffs
+        Simulate a full regular season + playoffs in array batches.
+        Remaining regular season weeks are simulated as a (n_sims, n_weeks, n_teams) score tensor,
+        and standings and the playoff bracket are resolved with array sorting
 
         Args:
             results: Up-to-date results for the regular season
-            n: Numer of simulations to run
+            n_sims: Number of simulations to run
+            rng: Random generator to draw scores from. Defaults to a fresh, unseeded generator
+            lineups: Rest of season best projected lineups. Built from ESPN if not provided,
+                pass them in when running many batches to avoid refetching
+            accumulator: Accumulator to add results to. A new one is created if not provided
+            chunk_size: Number of simulations held in memory at once
 
         Returns:
-            List of player objects representing the team's best projected lineup
+            Accumulator with per-team totals and win and seed histograms
         """
-        # get playoff weeks
+        rng = rng or np.random.default_rng()
+        lineups = lineups or self._build_season_lineups()
+        accumulator = accumulator or SeasonAccumulator(
+            team_ids=list(self.teams),
+            max_wins=2 * self.league_settings.regular_season_end
+        )
+        for start in range(0, n_sims, chunk_size):
+            self._simulate_season_chunk(
+                results=results,
+                n_sims=min(chunk_size, n_sims - start),
+                rng=rng,
+                lineups=lineups,
+                accumulator=accumulator
+            )
+        return accumulator
+
+    def _simulate_season_chunk(
+            self,
+            results: dict[int, dict],
+            n_sims: int,
+            rng: np.random.Generator,
+            lineups: dict[int, WeekLineups],
+            accumulator: SeasonAccumulator
+    ) -> None:
+        """Simulate `n_sims` full seasons at once and add them to `accumulator`"""
+        team_ids = accumulator.team_ids
+        n_teams = len(team_ids)
+        rows = np.arange(n_sims)[:, None]
+
         current_week = self.league_settings.current_week
         end = self.league_settings.regular_season_end
-        start_wk = end + 1 if current_week <= end else current_week  # check if currently in playoffs
         champ_wk = end + self.league_settings.playoff_length
-        playoff_wks_left = champ_wk - start_wk + 1
-        playoff_weeks = list(range(end + 1, champ_wk + 1))
-
-        lineups = self._build_season_lineups(n_sims=n_sims)
-
-        all_results = []
-        for sim in range(n_sims):
-            if sim % 1000 == 0:
-                print(f'{sim+1}/{n_sims}', end='\r')
-            # initialize sim counter
-            sim_results = {  # initialize sim counter
-                o: {
-                    'seed': 0,
-                    'matchup_wins': 0,
-                    'tophalf_wins': 0,
-                    'total_wins': 0,
-                    'total_points': 0,
-                    'most_wins': 0,
-                    'most_points': 0,
-                    'top_scores': 0,
-                    'playoffs': 0,
-                    'third': 0,
-                    'finals': 0,
-                    'champion': 0
-                }
-                for o in self.teams
-            }
-
-            sim_data = self._simulate_regular_season(results=results, lineups=lineups)
-            standings = self._get_final_standings(standings=sim_data)
-            for seed, (tid, stats) in enumerate(standings.items(), start=1):
-                stats['seed'] = seed
-            for_playoffs = {k: v for k, v in standings.items() if v['seed'] <= self.league_settings.playoff_teams}
-            playoff_teams = dict(sorted(for_playoffs.items(), key=lambda x: (x[1]['total_wins'], x[1]['total_points']), reverse=True))
-            # playoff_teams = list(standings)[:self.league_settings.playoff_teams]
-
-            qf_teams = set(playoff_teams.copy())
-            sf_teams = None
-            third_place_matchup = None
-            third = None
-            finals_matchup = None
-            champion = None
-            for i, week in enumerate(playoff_weeks[-playoff_wks_left:]):
-                n_bye = 2 if week == start_wk else None
-                playoff_teams = self._simulate_round(lineups=lineups, round_teams=playoff_teams, week=week, n_bye=n_bye)
-                if week == start_wk:  # quarterfinals
-                    sf_teams = set(playoff_teams)
-                if week == champ_wk - 1:  # semifinals
-                    finals_matchup = set(playoff_teams)
-                    third_place_matchup = set(t for t in sf_teams if t not in finals_matchup)
-                if week == champ_wk:  # championship
-                    # sim third place matchup
-                    third_place_lineups = {tid: l for tid, l in lineups[week].items() if tid in third_place_matchup}
-                    third_place_sim = {tid: self._simulate_lineup(l) for tid, l in third_place_lineups.items()}
-                    third = {max(third_place_sim.items(), key=lambda x: x[1])[0]}
-                    champion = set(playoff_teams.copy())
-
-            # update sim stats
-            most_wins = max(s['total_wins'] for s in standings.values())
-            most_points = max(s['total_points'] for s in standings.values())
-            n_most_wins = len([s['total_wins'] for s in standings.values() if s['total_wins'] == most_wins])  # in case there's a tie
-            n_most_points = len([s['total_points'] for s in standings.values() if s['total_points'] == most_points])  # in case there's a tie
-
-            for tid in self.teams:
-                sim_results[tid]['seed'] += standings[tid]['seed']
-                sim_results[tid]['matchup_wins'] += standings[tid]['matchup_wins']
-                sim_results[tid]['tophalf_wins'] += standings[tid]['tophalf_wins']
-                sim_results[tid]['total_wins'] += standings[tid]['total_wins']
-                sim_results[tid]['total_points'] += standings[tid]['total_points']
-                sim_results[tid]['top_scores'] += standings[tid]['top_scores']
-
-                if sim_data[tid]['total_points'] == most_points:
-                    sim_results[tid]['most_points'] += 1 / n_most_points
-
-                if sim_data[tid]['total_wins'] == most_wins:
-                    sim_results[tid]['most_wins'] += 1 / n_most_wins
-
-                # playoffs
-                if tid in qf_teams:
-                    sim_results[tid]['playoffs'] += 1
-
-                if tid in finals_matchup:
-                    sim_results[tid]['finals'] += 1
-
-                if tid in third:
-                    sim_results[tid]['third'] += 1
-
-                if tid in champion:
-                    sim_results[tid]['champion'] += 1
-            all_results.append(sim_results)
-        return all_results
+        reg_weeks = list(range(current_week, end + 1))
+
+        # regular season
+        totals = {k: np.zeros((n_sims, n_teams)) for k in ['matchup_wins', 'tophalf_wins', 'total_points', 'top_scores']}
+        for i, tid in enumerate(team_ids):
+            for k in totals:
+                totals[k][:, i] = (results or {}).get(tid, {}).get(k, 0)
+
+        if reg_weeks:
+            week_scores = np.stack([
+                lineups[week].simulate(score_bank=self.score_bank, rng=rng, n_sims=n_sims)
+                for week in reg_weeks
+            ], axis=1)  # (n_sims, n_weeks, n_teams)
+            for w, week in enumerate(reg_weeks):
+                scores = week_scores[:, w, :]
+                home_idx, away_idx = self._matchup_index(week=week, team_ids=team_ids)
+                totals['matchup_wins'] += engine.matchup_results(scores, home_idx, away_idx)
+                totals['tophalf_wins'] += engine.tophalf_results(scores)
+                totals['top_scores'] += scores == scores.max(axis=1, keepdims=True)
+            totals['total_points'] += week_scores.sum(axis=1)
+        totals['total_wins'] = totals['matchup_wins'] + totals['tophalf_wins']
+
+        order = engine.final_standings(
+            total_wins=totals['total_wins'],
+            total_points=totals['total_points'],
+            playoff_teams=self.playoff_teams
+        )
+        seeds = np.empty_like(order)
+        seeds[rows, order] = np.arange(1, n_teams + 1)
+
+        # playoffs
+        bracket = order[:, :self.playoff_teams]
+        n_bye = 2 ** int(np.ceil(np.log2(self.playoff_teams))) - self.playoff_teams
+        alive = {}
+        for week in range(end + 1, champ_wk + 1):
+            alive[week] = bracket
+            if week < current_week:
+                bracket = self._completed_playoff_round(bracket=bracket, seeds=seeds, week=week)
+                continue
+
+            scores = lineups[week].simulate(score_bank=self.score_bank, rng=rng, n_sims=n_sims)
+            if week == current_week:
+                bracket = self._current_playoff_round(scores=scores, bracket=bracket, seeds=seeds, week=week)
+            else:
+                bracket = engine.playoff_round(
+                    scores=scores,
+                    bracket=bracket,
+                    seeds=seeds,
+                    points=totals['total_points'],
+                    n_bye=n_bye if week == end + 1 else 0
+                )
+
+        # third place game between semifinal losers, played alongside the final
+        finals = alive[champ_wk]
+        semis = alive[champ_wk - 1]
+        semi_losers = semis[~(semis[:, :, None] == finals[:, None, :]).any(axis=2)].reshape(n_sims, -1)
+        if champ_wk < current_week:
+            third = self._completed_third_place(semi_losers=semi_losers, week=champ_wk)
+        else:
+            home, away = self._third_place_sides(semi_losers=semi_losers, week=champ_wk)
+            third, _ = engine.play_pairs(scores=scores, home=home, away=away)
+
+        accumulator.update(
+            seed=seeds,
+            most_wins=engine.split_leaders(totals['total_wins']),
+            most_points=engine.split_leaders(totals['total_points']),
+            playoffs=engine.team_mask(order[:, :self.playoff_teams], n_teams),
+            finals=engine.team_mask(finals, n_teams),
+            third=engine.team_mask(third, n_teams),
+            champion=engine.team_mask(bracket, n_teams),
+            **totals
+        )
+
+    def _completed_playoff_round(
+            self,
+            bracket: np.ndarray,
+            seeds: np.ndarray,
+            week: int
+    ) -> np.ndarray:
+        """
+        Advance a bracket through a playoff week that has already been played, using actual results.
+        Standings are final once in the playoffs, so every simulation shares the same bracket
+        """
+        team_ids = list(self.teams)
+        alive = {team_ids[i] for i in bracket[0]}
+        advances = []
+        for tid in alive:
+            result = self.results[tid].get(week)
+            if result is None or result.opponent_id not in alive or result.matchup_result == Result.WIN:
+                advances.append(team_ids.index(tid))
+        advances = np.broadcast_to(np.array(advances), (len(bracket), len(advances)))
+        return engine.seed_sort(advances, seeds)
+
+    def _completed_third_place(
+            self,
+            semi_losers: np.ndarray,
+            week: int
+    ) -> np.ndarray:
+        """
+        Winner of a third place game that has already been played, using the actual result.
+        The semifinal losers are the same in every simulation, and the higher seed takes third if the game wasn't played
+        """
+        team_ids = list(self.teams)
+        home, away = (team_ids[i] for i in semi_losers[0])
+        result = self.results[home].get(week)
+        if result is not None and result.opponent_id == away and result.matchup_result == Result.LOSS:
+            return semi_losers[:, 1:2]
+        return semi_losers[:, :1]
+
+    def _third_place_sides(
+            self,
+            semi_losers: np.ndarray,
+            week: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Home and away columns of the third place game. The current week's game follows the actual matchup,
+        otherwise the higher seed is at home
+        """
+        home, away = semi_losers[:, :1], semi_losers[:, 1:2]
+        if week != self.league_settings.current_week:
+            return home, away
+        home_idx, away_idx = self._matchup_index(week=week, team_ids=list(self.teams))
+        a, b = semi_losers[0]
+        if any(h == b and aw == a for h, aw in zip(home_idx, away_idx)):
+            return away, home
+        return home, away
+
+    def _current_playoff_round(
+            self,
+            scores: np.ndarray,
+            bracket: np.ndarray,
+            seeds: np.ndarray,
+            week: int
+    ) -> np.ndarray:
+        """
+        Simulate the current week's actual playoff matchups. Teams still alive without a playoff opponent advance
+        """
+        team_ids = list(self.teams)
+        alive = set(bracket[0].tolist())
+        home_idx, away_idx = self._matchup_index(week=week, team_ids=team_ids)
+        in_bracket = [i for i, (h, a) in enumerate(zip(home_idx, away_idx)) if h in alive and a in alive]
+        home_idx, away_idx = home_idx[in_bracket], away_idx[in_bracket]
+        byes = sorted(alive - set(home_idx.tolist()) - set(away_idx.tolist()))
+
+        n_sims = len(bracket)
+        winners, _ = engine.play_pairs(
+            scores=scores,
+            home=np.broadcast_to(home_idx, (n_sims, len(home_idx))),
+            away=np.broadcast_to(away_idx, (n_sims, len(away_idx)))
+        )
+        advances = np.concatenate([np.broadcast_to(np.array(byes, dtype=int), (n_sims, len(byes))), winners], axis=1)
+        return engine.seed_sort(advances, seeds)
 
     def _get_best_lineup(
             self,
             team: Team,
-            n_sims: int,
             n_flex: int = 1
     ) -> list[Player]:
         """
@@ -221,7 +324,6 @@ class Simulation:
 
         Args:
             team: Team object to calculate a best lineup for
-            n_sims: Number of simulations to run
             n_flex: number of flex starters in a lineup
 
         Returns:
@@ -318,285 +420,23 @@ class Simulation:
                         )
                     ])
 
-        # pre-compute gamma parameters for each player
-        for player in lineup:
-            if not player.is_locked:
-                gamma_values = self.gamma_map[player.position_id]
-                shape = gamma_values['shape']
-                max_val = gamma_values['max']
-                proj = (player.pts_proj_fp or player.pts_proj)
-                scale = proj / shape
-                cdf_max = st.gamma.cdf(max_val, a=shape, loc=0, scale=scale)
-
-                u = st.uniform.rvs(loc=0, scale=cdf_max, size=n_sims)
-                player.sim_scores = (s for s in st.gamma.ppf(u, a=shape, scale=scale))
         return lineup
 
-    @staticmethod
-    def _simulate_lineup(
-            lineup: list[Player]
-    ) -> float:
-        """
-        Simulate a team's total score using their best projected lineup.
-        Simulated scores use a gamma distribution
-
-        Args:
-            lineup: Starting lineup of the team to simulate
-
-        Returns:
-            List of player objects representing the team's best projected lineup
-        """
-        # add players who played
-        projected = 0.0
-        for player in lineup:
-            if player.is_locked:
-                # add if player played
-                projected += player.pts_act
-            else:
-                # simulate if not
-                sim = next(player.sim_scores)
-                projected += float(sim)
-        return projected
-
-    def _simulate_matchups(
-            self,
-            lineups: dict[int, list[Player]],
-            season: int = None,
-            week: int = None
-    ) -> list[TeamResult]:
-        """
-        Simulate all matchups for a given week
-
-        Args:
-            lineups: Best projected lineup for each team
-            season: Season to simulate in
-            week: Week to simulate in
-
-        Returns:
-            List of TeamResult matchup objects, with the tophalf_wins and wins fields empty
-        """
-
-        season = self.league_settings.season if not season else season
-        week = self.league_settings.current_week if not week else week
-        week_matchups = self.matchups[week]
-        matchups_sim = []
-        for i, matchup in enumerate(week_matchups):
-            game_id = i + 1  # used to group matchups for website
-
-            sim_scores = {}
-            for tid, team in matchup.teams.items():
-                score = self._simulate_lineup(lineup=lineups[tid])
-                sim_scores[tid] = score
-
-            teams = list(sim_scores.keys())
-            if len(teams) < 2:
-                # team in on bye
-                continue
-
-            t1, t2 = teams
-            s1, s2 = sim_scores[t1], sim_scores[t2]
-
-            # matchup result
-            game_type = (
-                GameType.POST
-                if self.league_settings.current_week > self.league_settings.regular_season_end
-                else GameType.REG
-            )
-            r1 = Result.WIN if s1 > s2 else Result.LOSS
-            r2 = Result.WIN if s2 > s1 else Result.LOSS
-            if s1 == s2:
-                r1 = r2 = Result.TIE
-
-            matchups_sim.extend([
-                TeamResult(
-                    season=season,
-                    week=week,
-                    game_id=game_id,
-                    game_type=game_type,
-                    team_id=t1,
-                    team_score=s1,
-                    opponent_id=t2,
-                    opponent_score=s2,
-                    matchup_result=r1,
-                    tophalf_result=None,
-                ),
-                TeamResult(
-                    season=season,
-                    week=week,
-                    game_id=game_id,
-                    game_type=game_type,
-                    team_id=t2,
-                    team_score=s2,
-                    opponent_id=t1,
-                    opponent_score=s1,
-                    matchup_result=r2,
-                    tophalf_result=None,
-                ),
-            ])
-        return matchups_sim
-
-    def _build_season_lineups(self, n_sims: int) -> dict:
+    def _build_season_lineups(self) -> dict[int, WeekLineups]:
         """
-        Build the best projected lineup for all remaining weeks, including playoffs
+        Build the best projected lineup for all remaining weeks, including playoffs.
+        `Player` objects are only kept while picking lineups, each week is stored as arrays
         """
         ros_lineups = {}
         end = self.league_settings.regular_season_end + self.league_settings.playoff_length
-        for week in range(self.league_settings.current_week, end+1):
-            dataloader = DataLoader(week=week)
+        weeks = list(range(self.league_settings.current_week, end+1))
+        payloads = self.dataloader.prefetch(views=['mTeam', 'mRoster'], weeks=weeks)
+        team_ids = list(self.teams)
+        for week in weeks:
             ctx = ParseContext(view=PlayerView.WEEK, week=week)
-            teams_obj = dataloader.teams()
-            rosters_obj = dataloader.rosters()
+            teams_obj = payloads[('mTeam', week)]
+            rosters_obj = payloads[('mRoster', week)]
             teams = Team.get_teams(dataloader=self.dataloader, fpros=self.fpros, obj=teams_obj, roster_obj=rosters_obj, ctx=ctx)
-            lineups = {i: self._get_best_lineup(team=t, n_sims=n_sims) for i, t in teams.items()}
-            ros_lineups[week] = lineups
+            lineups = {i: self._get_best_lineup(team=t) for i, t in teams.items()}
+            ros_lineups[week] = WeekLineups.from_players(lineups=lineups, team_ids=team_ids)
         return ros_lineups
-
-    def _simulate_regular_season(
-            self,
-            results: dict[int, dict],
-            lineups: dict,
-    ) -> dict[int, dict]:
-        """
-        Simulate a full regular season
-
-        Args:
-            results: Dictionary of season results up to the current week
-            lineups: Rest of season best projected lineup for each team
-
-        Returns:
-            List of TeamResult matchup objects, with the tophalf_wins and wins fields empty
-        """
-        # initialize counters
-        ros_results = {
-            tid: {
-                'matchup_wins': 0,
-                'tophalf_wins': 0,
-                'total_wins': 0,
-                'total_points': 0,
-                'top_scores': 0,
-            }
-            for tid in self.teams.keys()
-        }
-        for week in range(self.league_settings.current_week, 17+1):
-            if week <= self.league_settings.regular_season_end:
-                week_sim = {}
-                wk_lineups = lineups[week]
-                matchups_sim = self._simulate_matchups(lineups=wk_lineups, week=week)
-                scores = sorted(m.team_score for m in matchups_sim)
-                max_score = max(scores)
-                median_score = sum(scores[self.midpoint-1 : self.midpoint+1]) / 2
-                for team in matchups_sim:
-                    team.tophalf_result = (
-                        Result.WIN if team.team_score > median_score
-                        else Result.LOSS if team.team_score < median_score
-                        else Result.TIE
-                    )
-                    team.wins = team.tophalf_result.value + team.matchup_result.value
-                    team.top_score = 1 if team.team_score == max_score else 0
-                    week_sim[team.team_id] = team
-
-                for tid, team in week_sim.items():
-                    ros_results[tid]['matchup_wins'] += team.matchup_result.value
-                    ros_results[tid]['tophalf_wins'] += team.tophalf_result.value
-                    ros_results[tid]['total_wins'] += (team.matchup_result.value + team.tophalf_result.value)
-                    ros_results[tid]['total_points'] += team.team_score
-                    ros_results[tid]['top_scores'] += team.top_score
-
-        if results:
-            merged = {tid: stats.copy() for tid, stats in results.items()}
-            for tid, add_stats in ros_results.items():
-                if tid not in merged:
-                    merged[tid] = {}
-
-                for k, v in add_stats.items():
-                    merged[tid][k] = merged[tid].get(k, 0) + v
-            return merged
-        else:
-            return ros_results
-
-    def _get_final_standings(
-            self,
-            standings: dict[int, dict],
-            wild_card: bool = True
-    ) -> dict:
-        """
-        Calculate playoff teams (top 5 by total wins, 6th seed by points)
-
-        Args:
-            standings: Dictionary of season simulation and actual results
-            wild_card: True (default) if league uses a wild card for the last playoff spot earned by total points
-
-        Returns:
-            List of team IDs advancing to the playoffs
-        """
-        ordered = [
-            t[0] for t
-            in sorted(
-                standings.items(),
-                key=lambda x: (x[1]['total_wins'], x[1]['total_points']),
-                reverse=True
-            )
-        ]
-        if wild_card:
-            final_order = []
-            # top by wins, points
-            top = ordered[:self.playoff_teams-1]
-            final_order.extend(top)
-
-            # wild card by points
-            wc = [t[0] for t in sorted(standings.items(), key=lambda x: (x[1]['total_points']), reverse=True) if t[0] not in top][0]
-            final_order.extend([wc])
-
-            # rest by wins, points
-            bottom = [t for t in ordered if t not in final_order]
-            final_order.extend(bottom)
-            return {tid: standings[tid] for tid in final_order if tid in standings}
-        else:
-            # all playoff teams by total wins, points
-            standings = ordered[:self.playoff_teams]
-            return standings
-
-    def _simulate_round(
-            self,
-            lineups: dict,
-            round_teams: dict,
-            week: int,
-            n_bye: int | None = None,
-    ):
-        def get_winner(a: int, b: int) -> int:
-            if scores[a] > scores[b]:
-                return a
-            if scores[b] > scores[a]:
-                return b
-
-        advances = []
-        team_ids = list(round_teams.keys())
-        if n_bye:
-            advances.extend(team_ids[:n_bye])
-
-        non_bye_teams = [tid for tid in team_ids if tid not in advances]
-
-        if week == self.league_settings.current_week and week > self.league_settings.regular_season_end:
-            # if actual week is in the playoffs, simulate current matchup
-            round_lineups = {tid: lineups[week][tid] for tid in non_bye_teams}
-            results = self._simulate_matchups(lineups=round_lineups)
-            winners = [r.team_id for r in results if r.matchup_result.value == 1 and r.team_id in round_teams]
-            advances.extend(winners)
-            return advances
-
-        # if not in the playoffs, simulate lineup and get winners
-        # assumes top remaining seed plays lowest scoring team
-        scores = {tid: self._simulate_lineup(lineups[week][tid]) for tid in non_bye_teams}
-
-        # matchup 1 - top seed chooses lowest scorer
-        chooser = min(non_bye_teams, key=lambda tid: round_teams[tid]['seed'])
-        opp = min((tid for tid in non_bye_teams if tid != chooser), key=lambda tid: round_teams[tid]['total_points'])
-        advances.append(get_winner(chooser, opp))
-
-        remaining = [tid for tid in non_bye_teams if tid not in (chooser, opp)]
-        if remaining:
-            # matchup 2 - remaining teams
-            advances.append(get_winner(remaining[0], remaining[1]))
-
-        advances_dict = {k: v for k, v in round_teams.items() if k in advances}
-        return advances_dict
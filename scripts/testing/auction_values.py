@@ -11,9 +11,11 @@ from sklearn.mixture import GaussianMixture as gm
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
 import matplotlib.colors as colors
-import scipy.stats as stats
 import nfl_data_py as nfl
 import requests
+
+from auction.injuries import N_SEASON_WEEKS, injury_mask
+
 warnings.simplefilter(action='ignore')
 
 # parameters
@@ -597,31 +599,6 @@ def get_reference():
     return df2.groupby('position').quantile(0.8).reset_index()[['position', 'ppg', 'sd']]
 
 
-def sim_injury(mean_games, pos):
-    """
-    :param pos: position of the player
-    :return: the number of games missed by the player
-    mean games missed by position comes from this study (adjusted by 1):
-        https://www.profootballlogic.com/articles/nfl-injury-rate-analysis/
-    """
-
-    pos = pos.upper()
-    if pos != 'DST':
-        lower, upper, scale = 0, 18, mean_games[pos]
-        x = stats.truncexpon(b=(upper - lower) / scale, loc=lower, scale=scale)
-        games_missed = int(np.floor(x.rvs(1)[0]))
-
-        if games_missed == 0:
-            # print(np.nan)
-            return []
-        else:
-            # print(list(np.sort(random.sample(range(1, upper), games_missed))))
-            return list(np.sort(random.sample(range(1, upper), games_missed)))
-    else:
-        # print(np.nan)
-        return []
-
-
 def apply_wts(wt, pos):
     """
     :param wt: mean and standard deviation of position to draw a weight and apply to total points scored
@@ -644,7 +621,7 @@ def sim_scores(curr_sim_wk, teams, sim_data, posns, struc):
     sim_df["ppg"] = np.where((curr_sim_wk == sim_df.bye), 0, sim_df.ppg)
     sim_df['sd'] = np.where(sim_df.position == 'QB', sim_df.ppg*0.2, sim_df.ppg*0.4)
     sim_df = sim_df[(sim_df.start_week <= curr_sim_wk) & (sim_df.bye != curr_sim_wk)]  # kamara suspended first 3 games
-    sim_df = sim_df[~sim_df.missed.apply(lambda x: curr_sim_wk in x)]  # filter players who are injured that week
+    sim_df = sim_df[sim_df[f'available_wk{curr_sim_wk}']]  # filter players who are injured that week
 
     ref = get_reference()
 
@@ -831,6 +808,13 @@ wts = {'QB': {'mean': 0.9667, 'sd': 0.1690},
        'WR': {'mean': 1.0267, 'sd': 0.2586},
        'TE': {'mean': 0.9795, 'sd': 0.2370}}
 
+# simulate injuries for every sim at once
+availability = pd.DataFrame(
+    injury_mask(auction_sims.position.str.upper().to_numpy(), mean_gms_missed, np.random.default_rng())[0],
+    index=auction_sims.index,
+    columns=[f'available_wk{w}' for w in range(1, N_SEASON_WEEKS + 1)]
+)
+
 ref = get_reference()
 results_df = pd.DataFrame()
 max_sim = 1_000
@@ -840,8 +824,7 @@ for i in range(1, max_sim+1):
         print(f"{datetime.now().strftime('%H:%M:%S')} | START SIM")
 
     # start = time()
-    sim_data = auction_sims[auction_sims.sim == i]
-    sim_data['missed'] = sim_data.apply(lambda row: sim_injury(mean_gms_missed, row['position']), axis=1)  # simulate injuries
+    sim_data = auction_sims[auction_sims.sim == i].join(availability)
     sim_data['ppg'] = sim_data.ppg * sim_data.apply(lambda row: apply_wts(wts, row['position']), axis=1)  # apply random weights
     results = sim_season(teams)
     results['sim'] = i
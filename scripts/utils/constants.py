@@ -18,6 +18,10 @@ DB_NAME_SSH = os.getenv('DB_NAME_SSH')
 # MySQL host for SSH tunnel (e.g., hgupta.mysql.pythonanywhere-services.com)
 DB_MYSQL_HOST_SSH = os.getenv('DB_MYSQL_HOST_SSH')
 
+# connection pool, one SSH tunnel and pool kept open for the life of the process
+DB_POOLED = os.getenv('DB_POOLED', '1') == '1'
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+
 BUYIN = 150
 TOTAL_PAYOUT = BUYIN * 10
 WEEKLY_PAYOUT = 5 * 14
@@ -52,6 +56,26 @@ LEAGUE_ID = os.getenv('LEAGUE_ID')
 SWID = os.getenv('SWID')
 ESPN_S2 = os.getenv('ESPN_S2')
 
+# ESPN response cache
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+ESPN_CACHE_PATH = os.getenv('ESPN_CACHE_PATH', os.path.join(_ROOT, '.cache', 'espn.sqlite'))
+ESPN_CACHE_TTL = int(os.getenv('ESPN_CACHE_TTL', 300))  # seconds, current season only
+ESPN_OFFLINE = os.getenv('ESPN_OFFLINE', '0') == '1'  # serve only from the cache
+
+# Page model snapshots served by the Flask app
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', os.path.join(_ROOT, '.cache', 'snapshots'))
+SNAPSHOT_CHECK_INTERVAL = int(os.getenv('SNAPSHOT_CHECK_INTERVAL', 30))  # seconds between checks for a newer snapshot
+
+# Pages built on request when no current snapshot covers them
+PAGE_CACHE_DIR = os.getenv('PAGE_CACHE_DIR', os.path.join(_ROOT, '.cache', 'pages'))  # invalidation markers
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 900))  # seconds
+
+# Local replica of finalized database weeks, see scripts.utils.replica
+DB_REPLICA = os.getenv('DB_REPLICA', '1') == '1'
+DB_REPLICA_PATH = os.getenv('DB_REPLICA_PATH', os.path.join(_ROOT, '.cache', 'replica.sqlite'))
+DB_REPLICA_LAG = int(os.getenv('DB_REPLICA_LAG', 1))  # completed weeks still read from MySQL for stat corrections
+DB_OFFLINE = os.getenv('DB_OFFLINE', '0') == '1'  # serve replicated tables only from the replica
+
 # Database columns for inserts
 MATCHUP_COLUMNS = 'id, season, week, team, score, opponent, opponent_score, matchup_result, tophalf_result'
 POWER_RANK_COLUMNS = 'id, season, week, team, season_idx, week_idx, consistency_idx, manager_idx, luck_idx, power_score_raw, power_score_norm, power_rank, score_raw_change, score_norm_change, rank_change'
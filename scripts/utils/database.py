@@ -1,54 +1,243 @@
 from scripts.utils import constants
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+import atexit
+import threading
+
 import mysql.connector
+from mysql.connector import pooling
 import pandas as pd
 from sshtunnel import SSHTunnelForwarder
 
 
+def _open_tunnel() -> SSHTunnelForwarder:
+    tunnel = SSHTunnelForwarder(
+        (constants.DB_HOST_SSH, 22),
+        ssh_username=constants.DB_USER_SSH,
+        ssh_password=constants.PA_PASS,
+        remote_bind_address=(constants.DB_MYSQL_HOST_SSH, 3306)
+    )
+    tunnel.start()
+    return tunnel
+
+
+def _connection_args(tunnel: SSHTunnelForwarder | None) -> dict:
+    if tunnel is not None:
+        return {
+            'host': '127.0.0.1',
+            'port': tunnel.local_bind_port,
+            'user': constants.DB_USER_SSH,
+            'password': constants.DB_PASS_SSH,
+            'database': constants.DB_NAME_SSH
+        }
+    return {
+        'host': constants.DB_HOST,
+        'user': constants.DB_USER,
+        'password': constants.DB_PASS,
+        'database': constants.DB_NAME
+    }
+
+
+class ConnectionPool:
+    """
+    One SSH tunnel and MySQL connection pool kept open for the life of the process.
+    Connections are pinged before being handed out, and the tunnel and pool are rebuilt if either has dropped
+    """
+    def __init__(self, use_ssh: bool = True, size: int = constants.DB_POOL_SIZE):
+        """
+        Args:
+            use_ssh: Connect through an SSH tunnel
+            size: Number of connections in the pool
+        """
+        self.use_ssh = use_ssh
+        self.size = size
+        self.tunnel = None
+        self.pool = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        self.close()
+        if self.use_ssh:
+            self.tunnel = _open_tunnel()
+        self.pool = pooling.MySQLConnectionPool(
+            pool_name=f'cool_league_{"ssh" if self.use_ssh else "local"}',
+            pool_size=self.size,
+            pool_reset_session=True,
+            **_connection_args(self.tunnel)
+        )
+
+    def _is_healthy(self) -> bool:
+        return self.pool is not None and (not self.use_ssh or (self.tunnel is not None and self.tunnel.is_active))
+
+    def get_connection(self):
+        """
+        Pooled connection, returned to the pool when closed.
+        If every pooled connection is checked out, a one-off connection over the same tunnel is returned instead
+        """
+        with self._lock:
+            if not self._is_healthy():
+                self._start()
+            pool, tunnel = self.pool, self.tunnel
+        conn = self._checkout(pool, tunnel)
+        try:
+            conn.ping(reconnect=True, attempts=2, delay=1)
+        except mysql.connector.Error:
+            # tunnel or server dropped the connection, start over once unless another thread already has
+            with self._lock:
+                if self.pool is pool:
+                    self._start()
+                pool, tunnel = self.pool, self.tunnel
+            conn = self._checkout(pool, tunnel)
+        return conn
+
+    @staticmethod
+    def _checkout(pool: pooling.MySQLConnectionPool, tunnel: SSHTunnelForwarder | None):
+        try:
+            return pool.get_connection()
+        except mysql.connector.errors.PoolError:
+            # pool exhausted, closing this connection closes it outright
+            return mysql.connector.connect(**_connection_args(tunnel))
+
+    def close(self) -> None:
+        """Stop the tunnel. Connections still checked out are closed by the server"""
+        self.pool = None
+        if self.tunnel is not None:
+            self.tunnel.stop()
+            self.tunnel = None
+
+
+_POOLS: dict[bool, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(use_ssh: bool = True) -> ConnectionPool:
+    """Process-wide connection pool, created on first use"""
+    with _POOLS_LOCK:
+        if use_ssh not in _POOLS:
+            _POOLS[use_ssh] = ConnectionPool(use_ssh=use_ssh)
+        return _POOLS[use_ssh]
+
+
+@atexit.register
+def close_pools() -> None:
+    """Stop every pool's tunnel"""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+_OPERATORS = {'=', '!=', '<', '<=', '>', '>=', 'IN', 'NOT IN'}
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """
+    A single table read for `Database.retrieve_data` and `Database.retrieve_many`
+
+    Attributes:
+        table: Table to read
+        how: 'week' for a single week, 'season' for every week up to `week`, or 'all' for the whole table
+        season: Season to read, required unless `how` is 'all'
+        week: Week to read, required unless `how` is 'all'
+        columns: Columns to select, all columns if not given
+        where: Extra predicates, keyed by column with an optional operator, e.g. {'team': [1, 2], 'week >=': 3}.
+            A list value defaults to IN, anything else to =. Values are always bound, never formatted into the SQL
+        order_by: Columns to sort by, each optionally followed by ASC or DESC
+        limit: Maximum number of rows to return
+        name: Key of the result, defaults to `table`
+    """
+    table: str
+    how: str
+    season: int | None = None
+    week: int | None = None
+    columns: tuple[str, ...] | None = None
+    where: dict[str, Any] | None = None
+    order_by: tuple[str, ...] | None = None
+    limit: int | None = None
+    name: str | None = None
+
+    @property
+    def key(self) -> str:
+        return self.name or self.table
+
+    def to_sql(self) -> tuple[str, dict]:
+        """SQL with named placeholders and the parameters to bind to it"""
+        conditions, params = [], {}
+        if self.how in {'week', 'season'}:
+            if self.season is None or self.week is None:
+                raise ValueError(f'season and week are required when how={self.how}')
+            conditions.append('season = %(season)s')
+            conditions.append(f'week {"=" if self.how == "week" else "<="} %(week)s')
+            params.update(season=self.season, week=self.week)
+        elif self.how != 'all':
+            raise ValueError(f'how={self.how} is not supported. Must be one of: ["week", "season", "all"]')
+
+        for i, (key, value) in enumerate((self.where or {}).items()):
+            column, _, op = key.strip().partition(' ')
+            is_list = isinstance(value, (list, tuple, set, frozenset))
+            op = op.strip().upper() or ('IN' if is_list else '=')
+            if op not in _OPERATORS:
+                raise ValueError(f'Operator {op} is not supported. Must be one of: {sorted(_OPERATORS)}')
+            if op in {'IN', 'NOT IN'}:
+                values = list(value) if is_list else [value]
+                names = [f'w{i}_{j}' for j in range(len(values))]
+                params.update(zip(names, values))
+                if names:
+                    conditions.append(f'{column} {op} ({", ".join(f"%({n})s" for n in names)})')
+                else:
+                    conditions.append('FALSE' if op == 'IN' else 'TRUE')
+            else:
+                params[f'w{i}'] = value
+                conditions.append(f'{column} {op} %(w{i})s')
+
+        query = f'SELECT {", ".join(self.columns) if self.columns else "*"} FROM {self.table}'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        if self.order_by:
+            query += ' ORDER BY ' + ', '.join(self.order_by)
+        if self.limit is not None:
+            query += ' LIMIT %(limit)s'
+            params['limit'] = int(self.limit)
+        return query, params
+
+
 class Database:
     def __init__(
             self,
-            use_ssh: bool = True
+            use_ssh: bool = True,
+            pooled: bool = constants.DB_POOLED
     ) -> None:
         """
         Initializes a Database object
 
         Args:
             use_ssh (bool): use SSH tunnel to connect to the database remotely
+            pooled (bool): borrow a connection from the process-wide pool instead of opening a new tunnel and connection
         """
         self.use_ssh = use_ssh
+        self.pooled = pooled
         self.connection = None
         self.tunnel = None
 
     def __enter__(self):
-        if self.use_ssh:
-            self.tunnel = SSHTunnelForwarder(
-                (constants.DB_HOST_SSH, 22),
-                ssh_username=constants.DB_USER_SSH,
-                ssh_password=constants.PA_PASS,
-                remote_bind_address=(constants.DB_MYSQL_HOST_SSH, 3306)
-            )
-            self.tunnel.start()
-            self.connection = mysql.connector.connect(
-                host='127.0.0.1',
-                port=self.tunnel.local_bind_port,
-                user=constants.DB_USER_SSH,
-                password=constants.DB_PASS_SSH,
-                database=constants.DB_NAME_SSH
-            )
+        if self.pooled:
+            self.connection = get_pool(self.use_ssh).get_connection()
+        elif self.use_ssh:
+            self.tunnel = _open_tunnel()
+            self.connection = mysql.connector.connect(**_connection_args(self.tunnel))
         else:
-            self.connection = mysql.connector.connect(
-                host=constants.DB_HOST,
-                user=constants.DB_USER,
-                password=constants.DB_PASS,
-                database=constants.DB_NAME
-            )
+            self.connection = mysql.connector.connect(**_connection_args(None))
         return self.connection
 
     def __exit__(self, exc_type, exc_value, traceback):
         if self.connection:
-            self.connection.close()
+            self.connection.close()  # returns pooled connections to the pool
+            self.connection = None
         if self.tunnel:
             self.tunnel.stop()
+            self.tunnel = None
 
     def query(self, query: str):
         if not query:
@@ -56,29 +245,103 @@ class Database:
         with self as conn:
             return pd.read_sql(query, conn)
 
-    def retrieve_data(self, table: str, how: str, season: int = None, week: int = None):
-        query = ''
-        if how == 'week':
-            query = f'''
-                    SELECT *
-                    FROM {table}
-                    WHERE season = {season}
-                        AND week = {week};
-                    '''
-        if how == 'season':
-            query = f'''
-                    SELECT *
-                    FROM {table}
-                    WHERE season = {season}
-                        AND week <= {week};
-                    '''
-        if how == 'all':
-            query = f'''
-                    SELECT *
-                    FROM {table};
-                    '''
-        with self as conn:
-            return pd.read_sql(query, conn)
+    def retrieve_data(
+            self,
+            table: str,
+            how: str,
+            season: int = None,
+            week: int = None,
+            columns: list[str] | None = None,
+            where: dict[str, Any] | None = None,
+            order_by: list[str] | None = None,
+            limit: int | None = None
+    ) -> pd.DataFrame:
+        """
+        Read a table with bound parameters. See `TableQuery` for the filters
+
+        Args:
+            table: Table to read
+            how: 'week', 'season' (every week up to `week`) or 'all'
+            season: Season to read
+            week: Week to read
+            columns: Columns to select, all columns if not given
+            where: Extra predicates keyed by column and optional operator, e.g. {'team': [1, 2], 'week >=': 3}
+            order_by: Columns to sort by, each optionally followed by ASC or DESC
+            limit: Maximum number of rows to return
+        """
+        query = TableQuery(
+            table=table,
+            how=how,
+            season=season,
+            week=week,
+            columns=tuple(columns) if columns else None,
+            where=where,
+            order_by=tuple(order_by) if order_by else None,
+            limit=limit
+        )
+        return self._read_all([query])[0]
+
+    def retrieve_many(
+            self,
+            queries: list[TableQuery],
+            parallel: bool = False,
+            max_workers: int = 4
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Run several table reads in one go
+
+        Args:
+            queries: Reads to run
+            parallel: Run the reads concurrently, each on its own pooled connection. Otherwise they share one connection
+            max_workers: Maximum concurrent reads when `parallel` is True
+
+        Returns:
+            Dictionary of each query's key to its results
+        """
+        keys = [q.key for q in queries]
+        if len(set(keys)) != len(keys):
+            raise ValueError(f'Query keys must be unique, got {keys}. Set `name` to read a table more than once')
+
+        if parallel and len(queries) > 1:
+            def read(q: TableQuery) -> pd.DataFrame:
+                return Database(use_ssh=self.use_ssh, pooled=True)._read_all([q])[0]
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return dict(zip(keys, executor.map(read, queries)))
+
+        return dict(zip(keys, self._read_all(queries)))
+
+    def _read_all(self, queries: list[TableQuery]) -> list[pd.DataFrame]:
+        """Run reads over one connection, serving finalized weeks from the local replica when enabled"""
+        if not constants.DB_REPLICA:
+            with self as conn:
+                return [self._read(conn, q) for q in queries]
+
+        from scripts.utils.replica import get_replica
+        replica = get_replica()
+        plans = [replica.split(q) for q in queries]
+        with replica.lock:
+            syncs = replica.missing([local for local, _ in plans if local is not None])
+            if syncs:
+                with self as conn:
+                    for sync in syncs:
+                        replica.store(sync, self._read(conn, sync.query))
+
+        remote = [r for _, r in plans if r is not None]
+        if remote:
+            with self as conn:
+                remote = iter([self._read(conn, r) for r in remote])
+
+        results = []
+        for local, r in plans:
+            frames = ([replica.read(local)] if local is not None else []) + ([next(remote)] if r is not None else [])
+            results.append(frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True))
+        return results
+
+    @staticmethod
+    def _read(conn, query: TableQuery) -> pd.DataFrame:
+        sql, params = query.to_sql()
+        return pd.read_sql(sql, conn, params=params)
 
     def batch_insert(
             self,
@@ -96,7 +359,7 @@ class Database:
             rows (list[tuple]): ordered row tuples matching columns order
             table (str): name of the target table
             columns (str): comma-separated column names
-            chunk_size (int): number of rows per executemany call
+            chunk_size (int): number of rows per multi-row INSERT statement
             upsert (bool): if True, use ON DUPLICATE KEY UPDATE
             update_columns (list[str] | None): columns to update on duplicate key
                 defaults to all columns except common id fields
@@ -117,9 +380,9 @@ class Database:
                     f'Row {i} has {len(row)} values but expected {n_cols} for columns {cols}'
                 )
 
-        placeholders = ', '.join(['%s'] * n_cols)
+        row_sql = f'({", ".join(["%s"] * n_cols)})'
         col_sql = ', '.join(cols)
-        sql = f'INSERT INTO {table} ({col_sql}) VALUES ({placeholders})'
+        upsert_sql = ''
 
         if upsert:
             if update_columns is None:
@@ -128,7 +391,7 @@ class Database:
             if not update_columns:
                 raise ValueError('No columns available to update for upsert=True')
             update_sql = ', '.join([f'{c}=VALUES({c})' for c in update_columns])
-            sql = f'{sql} ON DUPLICATE KEY UPDATE {update_sql}'
+            upsert_sql = f' ON DUPLICATE KEY UPDATE {update_sql}'
             print_str = '{} rows updated in {}'
 
         total = 0
@@ -136,8 +399,10 @@ class Database:
             cur = conn.cursor()
             try:
                 for i in range(0, len(rows), chunk_size):
+                    # one multi-row VALUES statement per chunk
                     batch = rows[i:i + chunk_size]
-                    cur.executemany(sql, batch)
+                    sql = f'INSERT INTO {table} ({col_sql}) VALUES {", ".join([row_sql] * len(batch))}{upsert_sql}'
+                    cur.execute(sql, [value for row in batch for value in row])
                     total += len(batch)
                 conn.commit()
             except Exception:
@@ -146,6 +411,46 @@ class Database:
             finally:
                 cur.close()
 
+        if constants.DB_REPLICA and {'season', 'week'} <= set(cols):
+            from scripts.utils.replica import get_replica
+            season_idx, week_idx = cols.index('season'), cols.index('week')
+            get_replica().discard(table, {(int(row[season_idx]), int(row[week_idx])) for row in rows})
+
         print_str = '{} rows inserted in {}'
         print(print_str.format(total, table))
         return None
+
+    def insert_frame(
+            self,
+            table: str,
+            df: pd.DataFrame,
+            columns: str | None = None,
+            chunk_size: int = 1000,
+            upsert: bool = False,
+            update_columns: list[str] | None = None,
+    ) -> int:
+        """
+        Batch insert a DataFrame into a table, see `batch_insert`. Rows are converted in one pass
+        instead of building a Series per row, and missing values are inserted as NULL
+
+        Args:
+            table (str): name of the target table
+            df (pd.DataFrame): rows to insert
+            columns (str | None): comma-separated column names to insert, all of `df` if not given
+            chunk_size (int): number of rows per multi-row INSERT statement
+            upsert (bool): if True, use ON DUPLICATE KEY UPDATE
+            update_columns (list[str] | None): columns to update on duplicate key
+        Returns:
+            int: number of rows inserted
+        """
+        cols = [c.strip() for c in columns.split(',')] if columns else df.columns.tolist()
+        values = df[cols].astype(object)
+        rows = list(map(tuple, values.where(values.notna(), None).to_numpy().tolist()))
+        return self.batch_insert(
+            table=table,
+            columns=', '.join(cols),
+            rows=rows,
+            chunk_size=chunk_size,
+            upsert=upsert,
+            update_columns=update_columns
+        )
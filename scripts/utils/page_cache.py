@@ -0,0 +1,120 @@
+from typing import Callable
+import os
+import threading
+import time
+
+from scripts.utils import constants
+from scripts.utils.snapshots import SnapshotStore
+
+
+PAGES = ('home', 'simulations', 'scenarios', 'efficiency', 'champions', 'records')
+
+# pages built from each database table
+TABLE_PAGES = {
+    'matchups': ('home',),
+    'power_ranks': ('home',),
+    'betting_table': ('home', 'simulations'),
+    'season_sim': ('simulations',),
+    'season_sim_wins': ('simulations',),
+    'season_sim_ranks': ('simulations',),
+    'h2h': ('scenarios',),
+    'schedule_switcher': ('scenarios',),
+    'efficiency': ('efficiency',),
+    'records': ('records',),
+    'alltime_standings': ('records',),
+    'team_ids': PAGES,
+    'managers': PAGES,
+}
+
+
+def invalidate(*pages: str, directory: str = constants.PAGE_CACHE_DIR) -> None:
+    """
+    Mark pages as stale for every running app. Each page has a marker file whose modified time
+    is compared against when the cached page was built, so this works across processes
+
+    Args:
+        *pages: Pages to rebuild on their next request. All pages if none are given
+        directory: Folder to store markers in
+    """
+    os.makedirs(directory, exist_ok=True)
+    for page in pages or PAGES:
+        if page not in PAGES:
+            raise ValueError(f'Page {page} is not supported. Must be one of: {list(PAGES)}')
+        with open(os.path.join(directory, page), 'a'):
+            os.utime(os.path.join(directory, page))
+
+
+def invalidate_tables(*tables: str, directory: str = constants.PAGE_CACHE_DIR) -> None:
+    """Mark every page built from `tables` as stale. Called by the database update jobs after loading a table"""
+    pages = {page for table in tables for page in TABLE_PAGES.get(table, ())}
+    if pages:
+        invalidate(*sorted(pages), directory=directory)
+
+
+def last_invalidated(directory: str = constants.PAGE_CACHE_DIR) -> float:
+    """Modified time of the most recently invalidated page's marker, 0 if no page has been invalidated"""
+    times = [0.0]
+    for page in PAGES:
+        try:
+            times.append(os.path.getmtime(os.path.join(directory, page)))
+        except OSError:
+            pass
+    return max(times)
+
+
+class PageCache:
+    """
+    View model of each page, built on its first request and kept for `ttl` seconds or until the page is invalidated.
+    A snapshot newer than the page's last invalidation is served as is
+    """
+    def __init__(
+            self,
+            builders: dict[str, Callable[[], dict]],
+            ttl: int = constants.PAGE_CACHE_TTL,
+            directory: str = constants.PAGE_CACHE_DIR,
+            snapshots: SnapshotStore | None = None
+    ):
+        """
+        Args:
+            builders: Function building the view model of each page
+            ttl: Seconds to keep a built page
+            directory: Folder invalidation markers are written to
+            snapshots: Precomputed page models to serve before building anything
+        """
+        self.builders = builders
+        self.ttl = ttl
+        self.directory = directory
+        self.snapshots = snapshots
+        self._entries = {}
+        self._locks = {page: threading.Lock() for page in builders}
+
+    def _invalidated_at(self, page: str) -> float:
+        try:
+            return os.path.getmtime(os.path.join(self.directory, page))
+        except OSError:
+            return 0.0
+
+    def _is_fresh(self, page: str, stale_at: float) -> bool:
+        entry = self._entries.get(page)
+        return entry is not None and entry[0] >= stale_at and time.time() - entry[0] < self.ttl
+
+    def get(self, page: str) -> dict:
+        """View model of a single page"""
+        stale_at = self._invalidated_at(page)
+        snapshot = self.snapshots.current() if self.snapshots else None
+        if snapshot and page in snapshot['models'] and snapshot['created'] >= stale_at:
+            return snapshot['models'][page]
+
+        if not self._is_fresh(page, stale_at):
+            with self._locks[page]:
+                if not self._is_fresh(page, stale_at):  # built by another request while waiting
+                    built_at = time.time()
+                    self._entries[page] = (built_at, self.builders[page]())
+        return self._entries[page][1]
+
+    def clear(self, page: str | None = None) -> None:
+        """Drop built pages in this process only, all of them if `page` is not given"""
+        if page is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(page, None)
@@ -0,0 +1,206 @@
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, replace
+from typing import Iterator
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from scripts.utils import constants
+from scripts.utils.database import TableQuery
+
+
+# tables whose rows never change once a week is final
+REPLICA_TABLES = ('matchups', 'h2h', 'schedule_switcher', 'efficiency', 'power_ranks')
+_LAST_WEEK = 99  # every week of a finished season
+
+
+@dataclass(frozen=True)
+class SyncRange:
+    """Finalized weeks of a season not yet copied to the replica: `after` < week <= `through`"""
+    table: str
+    season: int
+    after: int
+    through: int
+
+    @property
+    def query(self) -> TableQuery:
+        return TableQuery(
+            table=self.table,
+            how='all',
+            where={'season': self.season, 'week >': self.after, 'week <=': self.through}
+        )
+
+
+class Replica:
+    """
+    Local SQLite copy of the finalized (season, week) partitions of `REPLICA_TABLES`.
+    Reads of finalized weeks are served locally, only weeks still in play go to MySQL.
+    Rewrites of copied weeks are only picked up through `discard`, which `Database.batch_insert` calls on the host
+    that wrote them, so a replica is only kept current on the host running the update jobs.
+    Anywhere else, `clear` it after those jobs rewrite finalized weeks
+    """
+    def __init__(
+            self,
+            path: str = constants.DB_REPLICA_PATH,
+            lag: int = constants.DB_REPLICA_LAG,
+            offline: bool = constants.DB_OFFLINE
+    ):
+        """
+        Args:
+            path: SQLite file to store partitions in. Parent directories are created if needed
+            lag: Completed weeks of the current season still read from MySQL, to pick up stat corrections
+            offline: Serve every week of `REPLICA_TABLES` from the replica and never sync
+        """
+        self.path = path
+        self.lag = lag
+        self.offline = offline
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS _replica_synced (
+                    tbl TEXT,
+                    season INTEGER,
+                    through INTEGER,
+                    PRIMARY KEY (tbl, season)
+                )
+            ''')
+            conn.execute('CREATE TABLE IF NOT EXISTS _replica_dtypes (tbl TEXT PRIMARY KEY, dtypes TEXT)')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection committed on success and closed on exit"""
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            yield conn
+
+    def final_week(self, season: int) -> int:
+        """Last week of `season` whose rows will no longer change"""
+        if self.offline or season < constants.SEASON:
+            return _LAST_WEEK
+        return constants.WEEK - 1 - self.lag
+
+    def split(self, query: TableQuery) -> tuple[TableQuery | None, TableQuery | None]:
+        """
+        Split a read into the part served by the replica and the part sent to MySQL
+
+        Returns:
+            Local and remote queries, either of which may be None
+        """
+        if (
+                query.table not in REPLICA_TABLES
+                or query.how not in {'week', 'season'}
+                or query.order_by
+                or query.limit is not None
+        ):
+            return None, query
+        final = self.final_week(query.season)
+        if query.week <= final:
+            return query, None
+        if query.how == 'week':
+            return None, query
+        return _bound_week(query, '<=', final), _bound_week(query, '>', final)
+
+    def missing(self, queries: list[TableQuery]) -> list[SyncRange]:
+        """Finalized partitions needed by local `queries` that have not been copied yet"""
+        if self.offline:
+            return []
+        ranges = []
+        for table, season in sorted({(q.table, q.season) for q in queries}):
+            synced, final = self._synced_through(table, season), self.final_week(season)
+            if synced < final:
+                ranges.append(SyncRange(table=table, season=season, after=synced, through=final))
+        return ranges
+
+    def store(self, sync: SyncRange, df: pd.DataFrame) -> None:
+        """
+        Save the rows fetched for `sync` and mark its weeks as copied. For the current season only weeks up to the
+        latest one with rows are marked, so weeks not yet written to MySQL are fetched again on the next read
+        """
+        through = sync.through
+        if sync.season >= constants.SEASON:
+            # a final week with no rows yet hasn't been written, not empty for good
+            through = min(through, int(df['week'].max())) if len(df) else sync.after
+            if through <= sync.after:
+                return
+        with self._connect() as conn:
+            if self._has_table(conn, sync.table):  # weeks discarded since they were first copied
+                conn.execute(
+                    f'DELETE FROM {sync.table} WHERE season = ? AND week > ? AND week <= ?',
+                    (sync.season, sync.after, through)
+                )
+            if len(df):
+                df.to_sql(sync.table, conn, if_exists='append', index=False)
+                conn.execute(
+                    'INSERT OR REPLACE INTO _replica_dtypes VALUES (?, ?)',
+                    (sync.table, json.dumps({c: str(t) for c, t in df.dtypes.items()}))
+                )
+            conn.execute('INSERT OR REPLACE INTO _replica_synced VALUES (?, ?, ?)', (sync.table, sync.season, through))
+
+    def read(self, query: TableQuery) -> pd.DataFrame:
+        """Run a read against the replica"""
+        sql, params = query.to_sql()
+        with self._connect() as conn:
+            if not self._has_table(conn, query.table):
+                return pd.DataFrame(columns=list(query.columns or []))
+            df = pd.read_sql(re.sub(r'%\((\w+)\)s', r':\1', sql), conn, params=params)
+            row = conn.execute('SELECT dtypes FROM _replica_dtypes WHERE tbl = ?', (query.table,)).fetchone()
+        for column, dtype in json.loads(row[0] if row else '{}').items():
+            if column in df and dtype.startswith('datetime64'):
+                df[column] = pd.to_datetime(df[column])
+        return df
+
+    def discard(self, table: str, partitions: set[tuple[int, int]]) -> None:
+        """Mark rewritten (season, week) partitions, and every later week of their season, to be copied again on the next read"""
+        if table not in REPLICA_TABLES or not partitions:
+            return
+        with self._connect() as conn:
+            for season, week in partitions:
+                conn.execute(
+                    'UPDATE _replica_synced SET through = MIN(through, ?) WHERE tbl = ? AND season = ?',
+                    (week - 1, table, season)
+                )
+
+    def clear(self, table: str | None = None) -> None:
+        """Remove replicated rows, for a single table if `table` is given"""
+        with self._connect() as conn:
+            for t in [table] if table else REPLICA_TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS {t}')
+                conn.execute('DELETE FROM _replica_synced WHERE tbl = ?', (t,))
+                conn.execute('DELETE FROM _replica_dtypes WHERE tbl = ?', (t,))
+
+    def _synced_through(self, table: str, season: int) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT through FROM _replica_synced WHERE tbl = ? AND season = ?', (table, season)
+            ).fetchone()
+        return row[0] if row else -1
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, table: str) -> bool:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone() is not None
+
+
+def _bound_week(query: TableQuery, op: str, week: int) -> TableQuery:
+    where = dict(query.where or {})
+    key = f'week {op}'
+    if key in where:
+        week = min(week, where[key]) if op == '<=' else max(week, where[key])
+    where[key] = week
+    return replace(query, where=where)
+
+
+_REPLICA = None
+_REPLICA_LOCK = threading.Lock()
+
+
+def get_replica() -> Replica:
+    """Process-wide replica, created on first use"""
+    global _REPLICA
+    with _REPLICA_LOCK:
+        if _REPLICA is None:
+            _REPLICA = Replica()
+        return _REPLICA
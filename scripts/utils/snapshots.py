@@ -0,0 +1,101 @@
+from typing import Callable
+import glob
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from scripts.utils import constants
+
+
+SNAPSHOT_PREFIX = 'page_models_'
+
+
+def write_snapshot(models: dict, directory: str = constants.SNAPSHOT_DIR, keep: int = 5) -> str:
+    """
+    Save page view models to a new versioned snapshot file. The file is written to a temporary name
+    and renamed into place, so readers never see a partial snapshot
+
+    Args:
+        models: View model for every page, keyed by name
+        directory: Folder to store snapshots in
+        keep: Number of most recent snapshots to keep
+
+    Returns:
+        Path of the new snapshot
+    """
+    os.makedirs(directory, exist_ok=True)
+    now = time.time_ns()
+    version = time.strftime('%Y%m%d%H%M%S', time.localtime(now // 10**9)) + f'{now % 10**9:09d}'
+    path = os.path.join(directory, f'{SNAPSHOT_PREFIX}{version}.pkl')
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump({'version': version, 'created': time.time(), 'models': models}, f)
+    os.replace(tmp_path, path)
+
+    for old in list_snapshots(directory)[:-keep]:
+        os.remove(old)
+    return path
+
+
+def list_snapshots(directory: str = constants.SNAPSHOT_DIR) -> list[str]:
+    """Snapshot files in `directory`, oldest first"""
+    return sorted(glob.glob(os.path.join(directory, f'{SNAPSHOT_PREFIX}*.pkl')))
+
+
+class SnapshotStore:
+    """
+    Serves the newest page model snapshot. The snapshot is loaded on first use and swapped for a newer one
+    when it appears, checking the folder at most once every `check_interval` seconds
+    """
+    def __init__(
+            self,
+            directory: str = constants.SNAPSHOT_DIR,
+            check_interval: int = constants.SNAPSHOT_CHECK_INTERVAL,
+            builder: Callable[[], dict] | None = None
+    ):
+        """
+        Args:
+            directory: Folder snapshots are written to
+            check_interval: Seconds between checks for a newer snapshot
+            builder: Builds the page models if no snapshot exists yet. The result is saved as a snapshot
+        """
+        self.directory = directory
+        self.check_interval = check_interval
+        self.builder = builder
+        self._path = None
+        self._snapshot = None
+        self._checked = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self) -> dict | None:
+        """Newest snapshot with its `version`, `created` time and `models`, or None if none has been written"""
+        if time.monotonic() - self._checked >= self.check_interval:
+            with self._lock:
+                self._refresh()
+        return self._snapshot
+
+    def get(self) -> dict:
+        """Page models of the newest snapshot"""
+        if self.current() is None:
+            if self.builder is None:
+                raise ValueError(f'No page snapshot found in {self.directory}. Run data_prep.py to build one')
+            with self._lock:
+                if self._snapshot is None:
+                    write_snapshot(self.builder(), directory=self.directory)
+                    self._refresh()
+        return self._snapshot['models']
+
+    @property
+    def version(self) -> str | None:
+        return self._snapshot['version'] if self._snapshot else None
+
+    def _refresh(self) -> None:
+        self._checked = time.monotonic()
+        snapshots = list_snapshots(self.directory)
+        if snapshots and snapshots[-1] != self._path:
+            with open(snapshots[-1], 'rb') as f:
+                self._snapshot = pickle.load(f)
+            self._path = snapshots[-1]